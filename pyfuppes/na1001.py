@@ -53,7 +53,6 @@ class FFI1001(object):
 
     def __init__(self, file=None, **kwargs):
         today = datetime.now(timezone.utc).date()
-        self.NLHEAD = 14  # minimum number of header lines is 14
         self.ONAME = "data origin"
         self.ORG = "organization"
         self.SNAME = "sampling description"
@@ -85,6 +84,19 @@ class FFI1001(object):
         """FFI is always 1001, as the class name indicates..."""
         return 1001
 
+    @property
+    def NLHEAD(self) -> int:
+        """Number of header lines; 14 fixed lines plus comments and variable names."""
+        return 14 + self.NSCOML + self.NNCOML + self.NV
+
+    @NLHEAD.setter
+    def NLHEAD(self, value: int):
+        if value != self.NLHEAD:
+            raise ValueError(
+                f"NLHEAD must be 14 + NSCOML + NNCOML + NV = {self.NLHEAD} (got {value}); "
+                "set SCOM, NCOM or VNAME instead"
+            )
+
     @property
     def SCOM(self) -> list[str]:
         """Special comments block"""
@@ -93,7 +105,6 @@ class FFI1001(object):
     @SCOM.setter
     def SCOM(self, value: list[str]):
         self._SCOM, self.NSCOML = value, len(value)
-        self.NLHEAD = 14 + self.NSCOML + self.NNCOML + self.NV
 
     @property
     def NCOM(self) -> list[str]:
@@ -103,7 +114,6 @@ class FFI1001(object):
     @NCOM.setter
     def NCOM(self, value: list[str]):
         self._NCOM, self.NNCOML = value, len(value)
-        self.NLHEAD = 14 + self.NSCOML + self.NNCOML + self.NV
 
     @property
     def VNAME(self) -> list[str]:
@@ -113,7 +123,6 @@ class FFI1001(object):
     @VNAME.setter
     def VNAME(self, value: list[str]):
         self._VNAME, self.NV = value, len(value)
-        self.NLHEAD = 14 + self.NSCOML + self.NNCOML
 
     @property
     def X(self) -> list[str]:
@@ -149,6 +158,8 @@ class FFI1001(object):
         """Load NASA Ames 1001 from text file."""
         nadict = rw.na1001_cls_read(file, **kwargs)
         for k in rw.KEYS:
+            if k == "NLHEAD":  # derived from NV, NSCOML and NNCOML
+                continue
             setattr(self, k, nadict[k])
 
     # ------------------------------------------------------------------------------
@@ -176,7 +187,13 @@ class FFI1001(object):
             0 -> failed, 1 -> successful write, 2 -> successful overwrite.
 
         """
-        return rw.na1001_cls_write(file, self.__dict__, **kwargs)
+        na_1001 = self.__dict__ | {"NLHEAD": self.NLHEAD}
+        result = rw.na1001_cls_write(file, na_1001, **kwargs)
+        # the writer corrects NV, NSCOML and NNCOML to match VNAME, SCOM and NCOM
+        for k in ("NV", "NSCOML", "NNCOML"):
+            setattr(self, k, na_1001[k])
+
+        return result
 
     # ------------------------------------------------------------------------------
     def to_dict_nparray(self, **kwargs) -> dict[str, np.ndarray]:
@@ -198,7 +215,7 @@ class FFI1001(object):
         vdtype : data type, optional
             Data type for dependent variable(s). The default is np.float.
         vmiss : missing value identifier, optional
-            The default is np.nan.
+            Replaces values equal to VMISS. The default is np.nan.
 
         Returns
         -------
@@ -266,7 +283,7 @@ class FFI1001(object):
         s = f"NASA Ames {self.FFI}\n---\n"
         s += "".join(
             [
-                f"{k.strip('_')} : {self.__dict__[k]}\n"
+                f"{k.strip('_')} : {getattr(self, k)}\n"
                 for k in (
                     "_SRC",
                     "NLHEAD",
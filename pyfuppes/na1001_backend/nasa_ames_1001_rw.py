@@ -3,6 +3,7 @@
 
 import os
 from datetime import date
+from itertools import repeat
 from pathlib import Path
 
 ###############################################################################
@@ -33,6 +34,16 @@ KEYS = [
     "_HEADER",
 ]
 
+# ASCII characters removed by str.strip()
+_WHITESPACE = frozenset(" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f")
+
+
+def _rmv_repeated(line, sep):
+    """Replace repeated occurrences of sep in line by a single one."""
+    while sep + sep in line:
+        line = line.replace(sep + sep, sep)
+    return line
+
 
 def na1001_cls_read(
     file,
@@ -83,14 +94,13 @@ def na1001_cls_read(
     file_content = decoded.split("\n")
 
     if strip_lines:
-        for i, line in enumerate(file_content):
-            file_content[i] = line.strip()
+        file_content = [line.strip() for line in file_content]
 
     if rmv_repeated_seps:
-        for i, line in enumerate(file_content):
-            while sep + sep in line:
-                line = line.replace(sep + sep, sep)
-            file_content[i] = line
+        if "\n" in sep:  # collapsing would merge lines
+            file_content = [_rmv_repeated(line, sep) for line in file_content]
+        else:  # all lines at once; each replace pass is a single scan in C
+            file_content = _rmv_repeated("\n".join(file_content), sep).split("\n")
 
     tmp = list(map(int, file_content[0].split()))
     assert len(tmp) == 2, f"invalid format in line 1: '{file_content[0]}'"
@@ -192,26 +202,47 @@ def na1001_cls_read(
     na_1001["_V"] = [[] for _ in range(n_vars)]  # list for each dependent variable
 
     if data is not None:
-        for ix, line in enumerate(data):
-            if line == "" or line == "\n":  # skip empty lines or trailing newline
-                continue
-
-            parts = line.rsplit(sep=sep_data)
-            assert (
-                len(parts) == n_vars + 1
-            ), f"invalid number of parameters in line {ix+nlhead+1}, have {len(parts)} ({parts}), want {n_vars+1}"
-
-            na_1001["_X"].append(parts[0].strip())
-            if vmiss_to_None:
-                for j in range(n_vars):
-                    na_1001["_V"][j].append(
-                        parts[j + 1].strip()
-                        if parts[j + 1].strip() != na_1001["VMISS"][j]
-                        else None
-                    )
+        lines = [line for line in data if line != "" and line != "\n"]
+        if sep_data and set(map(str.count, lines, repeat(sep_data))) == {n_vars}:
+            # all lines have the expected number of fields; split the whole data
+            # block at once and take every (n_vars+1)-th field as a column.
+            block = sep_data.join(lines)
+            fields = block.split(sep_data)
+            n_cols = n_vars + 1
+            # fields only need to be stripped if the block contains whitespace that
+            # is not the separator (one C-level scan per whitespace character)
+            whitespace = _WHITESPACE.difference(sep_data) if len(sep_data) == 1 else _WHITESPACE
+            if block.isascii() and not any(c in block for c in whitespace):
+                cols = [fields[j::n_cols] for j in range(n_cols)]
             else:
-                for j in range(n_vars):
-                    na_1001["_V"][j].append(parts[j + 1].strip())
+                cols = [[v.strip() for v in fields[j::n_cols]] for j in range(n_cols)]
+            na_1001["_X"] = cols[0]
+            for j in range(n_vars):
+                col = cols[j + 1]
+                if vmiss_to_None:
+                    vmiss = na_1001["VMISS"][j]
+                    col = [v if v != vmiss else None for v in col]
+                na_1001["_V"][j] = col
+        else:  # invalid lines (raise below) or sep_data=None
+            rows = []
+            for ix, line in enumerate(data):
+                if line == "" or line == "\n":  # skip empty lines or trailing newline
+                    continue
+
+                parts = line.rsplit(sep=sep_data)
+                assert (
+                    len(parts) == n_vars + 1
+                ), f"invalid number of parameters in line {ix+nlhead+1}, have {len(parts)} ({parts}), want {n_vars+1}"
+                rows.append(parts)
+
+            # one list comprehension per column, instead of appending value by value
+            na_1001["_X"] = [parts[0].strip() for parts in rows]
+            for j in range(n_vars):
+                col = [parts[j + 1].strip() for parts in rows]
+                if vmiss_to_None:
+                    vmiss = na_1001["VMISS"][j]
+                    col = [v if v != vmiss else None for v in col]
+                na_1001["_V"][j] = col
 
     return na_1001
 
@@ -235,9 +266,10 @@ def na1001_cls_write(
     """
     verboseprint = print if verbose else lambda *a, **k: None
 
-    # check if directory exists, create if not.
-    if not os.path.isdir(os.path.dirname(file_path)):
-        os.mkdir(os.path.dirname(file_path))
+    # check if directory exists, create if not. no directory means cwd.
+    dir_path = os.path.dirname(file_path)
+    if dir_path and not os.path.isdir(dir_path):
+        os.mkdir(dir_path)
 
     # check if file exists, act according to overwrite keyword
     if os.path.isfile(file_path):
@@ -247,7 +279,8 @@ def na1001_cls_write(
             )
             return 0  # write failed / forbidden
         write = 2  # overwriting
-    write = 1  # normal writing
+    else:
+        write = 1  # normal writing
 
     # check n variables and comment lines; adjust values if incorrect
     n_vars_named = len(na_1001["_VNAME"])
@@ -278,88 +311,43 @@ def na1001_cls_write(
 
     # begin the actual writing process
     with open(file_path, "w", encoding=encoding) as file_obj:
-        block = str(na_1001["NLHEAD"]) + sep + "1001\n"
-        file_obj.write(block)
-
-        block = str(na_1001["ONAME"]) + "\n"
-        file_obj.write(block)
-
-        block = str(na_1001["ORG"]) + "\n"
-        file_obj.write(block)
-
-        block = str(na_1001["SNAME"]) + "\n"
-        file_obj.write(block)
-
-        block = str(na_1001["MNAME"]) + "\n"
-        file_obj.write(block)
-
-        block = str(na_1001["IVOL"]) + sep + str(na_1001["NVOL"]) + "\n"
-        file_obj.write(block)
-
-        # dates: assume "yyyy m d" in tuple
-        block = (
-            "%4.4u" % na_1001["DATE"][0]
-            + sep
-            + "%2.2u" % na_1001["DATE"][1]
-            + sep
-            + "%2.2u" % na_1001["DATE"][2]
-            + sep
-            + "%4.4u" % na_1001["RDATE"][0]
-            + sep
-            + "%2.2u" % na_1001["RDATE"][1]
-            + sep
-            + "%2.2u" % na_1001["RDATE"][2]
-            + "\n"
-        )
-        file_obj.write(block)
-
-        file_obj.write(f"{na_1001['DX']}" + "\n")
-
-        # obsolete: CARIBIC
-        # file_obj.write(sep_com.join(na_1001["XNAME"]) + "\n")
-        file_obj.write(na_1001["XNAME"] + "\n")
-
         n_vars = na_1001["NV"]  # get number of variables
-        block = str(n_vars) + "\n"
-        file_obj.write(block)
-
-        line = ""
-        for i in range(n_vars):
-            line += str(na_1001["VSCAL"][i]) + sep
-        line = line[0:-1] if line.endswith("\n") else line[0:-1] + "\n"
-        file_obj.write(line)
-
-        line = ""
-        for i in range(n_vars):
-            line += str(na_1001["VMISS"][i]) + sep
-        line = line[0:-1] if line.endswith("\n") else line[0:-1] + "\n"
-        file_obj.write(line)
-
-        block = na_1001["_VNAME"]
-        for i in range(n_vars):
-            file_obj.write(block[i] + "\n")
-
-        nscoml = na_1001["NSCOML"]  # get number of special comment lines
-        line = str(nscoml) + "\n"
-        file_obj.write(line)
-
-        block = na_1001["_SCOM"]
-        for i in range(nscoml):
-            file_obj.write(block[i] + "\n")
-
-        nncoml = na_1001["NNCOML"]  # get number of normal comment lines
-        line = str(nncoml) + "\n"
-        file_obj.write(line)
-
-        block = na_1001["_NCOM"]
-        for i in range(nncoml):
-            file_obj.write(block[i] + "\n")
-
-        for i, x in enumerate(na_1001["_X"]):
-            line = str(x) + sep_data
-            for j in range(n_vars):
-                line += str(na_1001["_V"][j][i]) + sep_data
-            file_obj.write(line[0:-1] + "\n")
+        # dates: assume "yyyy m d" in tuple
+        (y, m, d), (ry, rm, rd) = na_1001["DATE"][:3], na_1001["RDATE"][:3]
+
+        # collect the header lines, and write them in one go
+        header = [
+            f"{na_1001['NLHEAD']}{sep}1001",
+            str(na_1001["ONAME"]),
+            str(na_1001["ORG"]),
+            str(na_1001["SNAME"]),
+            str(na_1001["MNAME"]),
+            f"{na_1001['IVOL']}{sep}{na_1001['NVOL']}",
+            # %u: accepts floats as well (truncated), unlike int format specs
+            sep.join(
+                ("%4.4u" % y, "%2.2u" % m, "%2.2u" % d, "%4.4u" % ry, "%2.2u" % rm, "%2.2u" % rd)
+            ),
+            f"{na_1001['DX']}",
+            # obsolete: CARIBIC
+            # sep_com.join(na_1001["XNAME"])
+            na_1001["XNAME"],
+            str(n_vars),
+            sep.join(str(na_1001["VSCAL"][i]) for i in range(n_vars)),
+            sep.join(str(na_1001["VMISS"][i]) for i in range(n_vars)),
+            *na_1001["_VNAME"],
+            str(na_1001["NSCOML"]),  # number of special comment lines
+            *na_1001["_SCOM"],
+            str(na_1001["NNCOML"]),  # number of normal comment lines
+            *na_1001["_NCOM"],
+        ]
+        file_obj.write("\n".join(header) + "\n")
+
+        # one row of X and V per line; strict: the lengths of X and each V must match.
+        # convert column-wise to str, then join rows and lines in one go.
+        cols = [list(map(str, c)) for c in (na_1001["_X"], *na_1001["_V"])]
+        rows = zip(*cols, strict=True)
+        if cols[0]:
+            file_obj.write("\n".join(map(sep_data.join, rows)) + "\n")
 
     return write
 
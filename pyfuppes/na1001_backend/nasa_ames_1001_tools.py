@@ -14,6 +14,22 @@ MICROSECONDS_PER_SECOND = 1_000_000
 ###############################################################################
 
 
+def _vmiss_mask(arr, vmiss):
+    """
+    Boolean mask of the elements in arr that are equal to the missing value vmiss.
+
+    VMISS is a sentinel, so the comparison is exact. For floating point arrays,
+    vmiss is cast to the array's dtype first, so that e.g. float32 data still
+    matches a VMISS that is not exactly representable.
+    """
+    if arr.dtype.kind == "f":
+        vmiss = arr.dtype.type(vmiss)
+    return arr == vmiss
+
+
+###############################################################################
+
+
 def naDict_2_npndarr(
     naDict,
     sel_vnames=None,
@@ -37,21 +53,27 @@ def naDict_2_npndarr(
     if clean_vnames:
         sel_vnames = [k.replace(" ", "") for k in sel_vnames]
 
-    # for each parameter, find its index in naDict['V']
+    # map each variable name to its (first) index in naDict['V']
+    names = naDict["_VNAME"]
+    if vname_delimiter:
+        names = [name.split(vname_delimiter)[split_idx] for name in names]
+    name_ix = {name: ix for ix, name in reversed(list(enumerate(names)))}
+
     for parm in sel_vnames:
-        if vname_delimiter:
-            ix = [name.split(vname_delimiter)[split_idx] for name in naDict["_VNAME"]].index(parm)
-        else:
-            ix = naDict["_VNAME"].index(parm)
+        if parm not in name_ix:
+            raise ValueError(f"{parm!r} is not in VNAME")
+        ix = name_ix[parm]
         npDict[parm] = np.array(naDict["_V"][ix], dtype=vdtype)
 
         # check vmiss: make sure that vmiss=0 also works by checking for type
         # boolean. Might be a bit confusing since vmiss=True would also result
         # in keeping the original values.
         if not isinstance(vmiss, bool):
-            npDict[parm][np.isclose(npDict[parm], float(naDict["VMISS"][ix]))] = vmiss
-        # account for VSCAL:
-        npDict[parm] *= float(naDict["VSCAL"][ix])
+            npDict[parm][_vmiss_mask(npDict[parm], float(naDict["VMISS"][ix]))] = vmiss
+        # account for VSCAL; a scale of 1 (most common) needs no pass over the data:
+        vscal = float(naDict["VSCAL"][ix])
+        if vscal != 1:
+            npDict[parm] *= vscal
 
     return npDict
 
@@ -59,6 +81,40 @@ def naDict_2_npndarr(
 ###############################################################################
 
 
+def _xv_arrays(naDict, dtype):
+    """
+    Cast X and V of na1001 class instance to numpy arrays, for the DataFrame converters.
+
+    Missing values in V are set to NaN, then V is scaled by VSCAL.
+    """
+    # begin extraction with independent variable:
+    values = [np.array(naDict["_X"], dtype=dtype)]
+
+    # include scaling factors and missing values:
+    vmiss = [float(s) for s in naDict["VMISS"]]
+    vscal = [float(s) for s in naDict["VSCAL"]]
+
+    # for each variable...
+    for i, v_n in enumerate(naDict["_V"]):
+        # cast list of string to np.array:
+        arr = np.array(v_n, dtype=dtype)
+        # replace missing values with np.nan:
+        arr[_vmiss_mask(arr, vmiss[i])] = np.nan
+        # scale; in place if that keeps the dtype, to avoid a temporary array.
+        # a scale of 1 (most common) then needs no pass over the data at all.
+        if np.result_type(arr, vscal[i]) == arr.dtype:
+            if vscal[i] != 1:
+                arr *= vscal[i]
+        else:
+            arr = arr * vscal[i]
+        values.append(arr)
+
+    return values
+
+
+###############################################################################
+
+
 def naDict_2_pddf(
     naDict,
     sep_colhdr="\t",
@@ -78,21 +134,7 @@ def naDict_2_pddf(
     if clean_colnames:
         keys = [k.replace(" ", "") for k in keys]
 
-    # begin extraction with independent variable:
-    values = [np.array(naDict["_X"], dtype=dtype)]
-
-    # include scaling factors and missing values:
-    vmiss = [float(s) for s in naDict["VMISS"]]
-    vscal = [float(s) for s in naDict["VSCAL"]]
-
-    # for each variable...
-    for i, v_n in enumerate(naDict["_V"]):
-        # cast list of string to np.array:
-        arr = np.array(v_n, dtype=dtype)
-        # replace missing values with np.nan:
-        arr[np.isclose(arr, vmiss[i])] = np.nan
-        # add array to list of arrays:
-        values.append(arr * vscal[i])
+    values = _xv_arrays(naDict, dtype)
 
     df = pd.DataFrame.from_dict(dict(zip(keys, values)))
 
@@ -131,21 +173,7 @@ def naDict_2_poldf(
     if clean_colnames:
         keys = [k.replace(" ", "") for k in keys]
 
-    # # begin extraction with independent variable:
-    values = [np.array(naDict["_X"], dtype=_dtype)]
-
-    # # include scaling factors and missing values:
-    vmiss = [float(s) for s in naDict["VMISS"]]
-    vscal = [float(s) for s in naDict["VSCAL"]]
-
-    # for each variable...
-    for i, v_n in enumerate(naDict["_V"]):
-        # cast list of string to np.array:
-        arr = np.array(v_n, dtype=_dtype)
-        # replace missing values with np.nan:
-        arr[np.isclose(arr, vmiss[i])] = np.nan
-        # add array to list of arrays:
-        values.append(arr * vscal[i])
+    values = _xv_arrays(naDict, _dtype)
 
     df = pl.DataFrame(dict(zip(keys, values)))
 
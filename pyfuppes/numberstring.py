@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 """Number to string and vice versa."""
 
+import functools
 import re
 from typing import Union
 
@@ -9,6 +10,19 @@ import numpy as np
 ###############################################################################
 
 
+@functools.lru_cache(maxsize=16)
+def _patterns(dec_sep: str) -> dict[str, re.Pattern]:
+    """Compiled regular expression per general classification; once per decimal separator."""
+    regexes = {
+        "dec": f"[+-]?[0-9]+[{dec_sep}][0-9]*|[+-]?[0-9]*[{dec_sep}][0-9]+",
+        "no_dec": "[+-]?[0-9]+",
+        "exp_dec": f"[+-]?[0-9]+[{dec_sep}][0-9]*[eE][+-]*[0-9]+",
+        "exp_no_dec": "[+-]?[0-9]+[eE][+-]*[0-9]+",
+    }
+
+    return {k: re.compile(v) for k, v in regexes.items()}
+
+
 class NumStr(object):
     """Analyse the format of a string representing a number."""
 
@@ -30,12 +44,6 @@ class NumStr(object):
         """
         self.input_string = input_string
         self.dec_sep = dec_sep
-        self.regexes = {
-            "dec": f"[+-]?[0-9]+[{self.dec_sep}][0-9]*|[+-]?[0-9]*[{self.dec_sep}][0-9]+",
-            "no_dec": "[+-]?[0-9]+",
-            "exp_dec": f"[+-]?[0-9]+[{self.dec_sep}][0-9]*[eE][+-]*[0-9]+",
-            "exp_no_dec": "[+-]?[0-9]+[eE][+-]*[0-9]+",
-        }
 
     def analyse_format(self):
         """
@@ -52,13 +60,12 @@ class NumStr(object):
                     format code to be used in f-string.
                     suited Python type for the number, int or float.
         """
-        # 1. format definitions. key = general classification.
+        # 1. format definitions (key = general classification): see _patterns.
 
         # 2. analyse the format to find the general classification.
         gen_class, string = [], self.input_string.strip()
-        for k, v in self.regexes.items():
-            test = re.fullmatch(v, string)
-            if test:
+        for k, pattern in _patterns(self.dec_sep).items():
+            if pattern.fullmatch(string):
                 gen_class.append(k)
         if not gen_class:
             raise TypeError("unknown format -->", string)
@@ -66,9 +73,7 @@ class NumStr(object):
             raise TypeError("ambiguous result -->", string, gen_class)
 
         # 3. based on the general classification, parse the string
-        method_name = "_parse_" + str(gen_class[0])
-        method = getattr(self, method_name, lambda *args: "Undefined Format!")
-        return method(string)
+        return self._PARSERS[gen_class[0]](self, string)
 
     def _parse_dec(self, s):
         """Number is a decimal."""
@@ -97,13 +102,23 @@ class NumStr(object):
         result = result.lower() if "e" in s else result
         return (result, float)
 
+    # general classification -> parsing function
+    _PARSERS = {
+        "dec": _parse_dec,
+        "no_dec": _parse_no_dec,
+        "exp_dec": _parse_exp_dec,
+        "exp_no_dec": _parse_exp_no_dec,
+    }
+
 
 ###############################################################################
 
+_STRIP_FUNCS = {"right": str.rstrip, "left": str.lstrip, "both": str.strip}
+
 
 def dec2str_stripped(
     num: Union[float, list, np.ndarray], dec_places: int = 3, strip: str = "right"
-) -> str:
+) -> list[str]:
     """
     Convert floating point number to string, with zeros stripped.
 
@@ -121,19 +136,20 @@ def dec2str_stripped(
     list of string.
         numbers formatted as strings according to specification (see kwargs).
     """
-    if not isinstance(num, list):  # might be scalar or numpy array
-        try:
-            num = list(num)
-        except TypeError:  # input was scalar
-            num = [num]
-
     if not isinstance(dec_places, int) or int(dec_places) < 1:
         raise ValueError(f"kwarg dec_places must be integer > 1 (got {dec_places})")
 
-    if strip == "right":
-        return [f"{n:.{str(dec_places)}f}".rstrip("0") for n in num]
-    if strip == "left":
-        return [f"{n:.{str(dec_places)}f}".lstrip("0") for n in num]
-    if strip == "both":
-        return [f"{n:.{str(dec_places)}f}".strip("0") for n in num]
-    raise ValueError(f"kwarg 'strip' must be 'right', 'left' or 'both' (got '{strip}')")
+    strip_func = _STRIP_FUNCS.get(strip) if isinstance(strip, str) else None
+    if strip_func is None:
+        raise ValueError(f"kwarg 'strip' must be 'right', 'left' or 'both' (got '{strip}')")
+
+    if not isinstance(num, list):  # might be scalar or iterable
+        if isinstance(num, (int, float, np.number)):  # skip the failing list() call
+            num = (num,)
+        else:
+            try:
+                num = list(num)
+            except TypeError:  # input was scalar
+                num = [num]
+
+    return [strip_func(f"{n:.{dec_places}f}", "0") for n in num]
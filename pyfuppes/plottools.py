@@ -1,9 +1,29 @@
 # -*- coding: utf-8 -*-
 """Helpers to format plots."""
 
+import math
 from typing import Optional, Union
 
 import numpy as np
+from numba import njit
+
+###############################################################################
+
+
+@njit
+def _finite_minmax(v: np.ndarray) -> tuple[float, float, int]:
+    """Minimum, maximum and number of finite elements of v, in a single pass. Code gets numba-JIT compiled."""
+    v_min, v_max, n = np.inf, -np.inf, 0
+    for value in v:
+        if np.isfinite(value):
+            n += 1
+            if value < v_min:
+                v_min = value
+            if value > v_max:
+                v_max = value
+
+    return v_min, v_max, n
+
 
 ###############################################################################
 
@@ -41,7 +61,7 @@ def get_plot_range(
 
     """
     if isinstance(v, np.ma.masked_array):
-        v = v[~v.mask]
+        v = v.compressed()
 
     if not isinstance(v, np.ndarray):
         v = np.array(v)  # ensure array type
@@ -49,20 +69,19 @@ def get_plot_range(
     if x is not None and xrange is not None:
         if not isinstance(x, np.ndarray):
             x = np.array(x)
-        x = np.sort(x)  # monotonically increasing x-vector (e.g. time)
         if len(x) == len(v):
             w_xvd = (x >= xrange[0]) & (x <= xrange[1])
             v = v[w_xvd]
 
-    v = v[np.isfinite(v)]
+    v_min, v_max, n_finite = _finite_minmax(v)
 
-    if len(v) < 2:
+    if n_finite < 2:
         # it is better not to raise an exception in case no valid input,
         # to avoid errors further down...
         return [-1, 1]
 
-    v_min, v_max = v.min(), v.max()
-    offset = (abs(v_min) + abs(v_max)) / 2 * add_percent / 100
+    scale = add_percent * 0.005  # = add_percent / 100 / 2
+    offset = (abs(v_min) + abs(v_max)) * scale
     result = [v_min - offset, v_max + offset]
 
     if v_min_lim and result[0] < v_min_lim:
@@ -96,12 +115,13 @@ def nticks_yrange(yrange: list[float], nticks: int, to_multiples_of: int = 10) -
         updated yrange.
 
     """
+    # round down / up to multiples; Python's modulo has the sign of the divisor
     result = [
-        np.floor(yrange[0] / to_multiples_of) * to_multiples_of,
-        np.ceil(yrange[1] / to_multiples_of) * to_multiples_of,
+        yrange[0] - yrange[0] % to_multiples_of,
+        yrange[1] + (-yrange[1]) % to_multiples_of,
     ]
 
-    size = np.lcm(nticks - 1, to_multiples_of)
+    size = math.lcm(nticks - 1, to_multiples_of)
     n, r = divmod((result[1] - result[0]), size)
 
     add = 1 if r > to_multiples_of else 0
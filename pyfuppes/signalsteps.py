@@ -14,9 +14,52 @@ Input arguments:
 
 import numpy as np
 from matplotlib import pyplot as plt
+from numba import njit
 
 ###############################################################################
 
+_RESUM_EVERY = 1024  # see _detect_steps_kernel
+
+
+@njit(cache=True)
+def _detect_steps_kernel(
+    values: np.ndarray, n_before: int, n_after: int, thresh: float
+) -> np.ndarray:
+    """
+    Compare the mean of n_before values before each value with the mean of n_after values after it.
+
+    Returns +1 for a step up, -1 for a step down and 0 otherwise. The n_before first and
+    n_after last elements are not analysed (0). Code gets numba-JIT compiled.
+
+    The window sums slide along with the index (add the incoming value, subtract the
+    outgoing one). They are summed from scratch every _RESUM_EVERY indices, to limit the
+    rounding drift of the sliding update, and after non-finite values.
+    """
+    n = values.shape[0]
+    log = np.zeros(n)
+    if n_before == 0 or n_after == 0:  # mean of an empty window is nan; no steps
+        return log
+
+    before_sum, after_sum = 0.0, 0.0
+    for i in range(n_before, n - n_after):
+        if (i - n_before) % _RESUM_EVERY and np.isfinite(before_sum + after_sum):
+            before_sum += values[i - 1] - values[i - 1 - n_before]
+            after_sum += values[i + n_after] - values[i]
+        else:
+            before_sum = 0.0
+            for j in range(i - n_before, i):
+                before_sum += values[j]
+            after_sum = 0.0
+            for j in range(i + 1, i + n_after + 1):
+                after_sum += values[j]
+        delta = before_sum / n_before - after_sum / n_after
+        if delta > thresh:  # step down
+            log[i] = -1
+        elif delta < thresh * -1:  # step up
+            log[i] = 1
+
+    return log
+
 
 class SteppedData:
     """Class to hold the "stepped" data and its properties."""
@@ -46,52 +89,46 @@ class SteppedData:
         extend_edges=True,
         plot=True,
     ):
+        n_before, n_after = look_around[0], look_around[1]
         if extend_edges:
-            self.values = np.insert(self.values, 0, np.repeat(self.values[0], look_around[0]))
-            self.values = np.append(self.values, np.repeat(self.values[-1], look_around[1]))
-        self.log = np.zeros(len(self.values))
-        clrs = ["k"] * len(self.values)
-        for i in range(look_around[0], len(self.values) - look_around[1]):
-            before = np.average(self.values[i - look_around[0] : i])
-            after = np.average(self.values[i + 1 : i + look_around[1] + 1])
-            if before - after < thresh * -1:  # step up
-                self.log[i], clrs[i] = 1, "r"
-            if before - after > thresh:  # step down
-                self.log[i], clrs[i] = -1, "b"
-            if self.log[i - 1] == 0 and self.log[i] != 0:
-                self.n_steps += 1
-            if self.log[i - 1] != 0 and self.log[i] == 0:
-                self.n_plats += 1
-            if i == look_around[0] and self.log[i] == 0:
-                self.n_plats += 1
+            self.values = np.pad(self.values, (n_before, n_after), mode="edge")
+        n = len(self.values)
+        self.log = _detect_steps_kernel(
+            np.asarray(self.values, dtype=float), n_before, n_after, float(thresh)
+        )
+
+        # count transitions plateau -> step and step -> plateau;
+        # a plateau at the first analysed index counts as well
+        is_step = self.log[n_before : n - n_after] != 0
+        was_step = np.concatenate(([False], is_step[:-1]))
+        self.n_steps += int(np.count_nonzero(is_step & ~was_step))
+        self.n_plats += int(np.count_nonzero(~is_step & was_step))
+        if is_step.size and not is_step[0]:
+            self.n_plats += 1
+
+        clrs = np.where(self.log == 1, "r", np.where(self.log == -1, "b", "k")).tolist()
 
         if extend_edges:
-            self.values = self.values[look_around[0] : -look_around[1]]
-            self.log = self.log[look_around[0] : -look_around[1]]
-            clrs = clrs[look_around[0] : -look_around[1]]
+            self.values = self.values[n_before : n - n_after]
+            self.log = self.log[n_before : n - n_after]
+            clrs = clrs[n_before : n - n_after]
 
-        self.ix_plat = np.where(self.log == 0)
+        # boolean masks; index the values directly
+        self.ix_plat = self.log == 0
         self.values_plat = self.values[self.ix_plat]
-        self.ix_stepup = np.where(self.log == 1)
-        self.ix_stepdown = np.where(self.log == -1)
-
-        for i in range(len(self.log)):
-            if self.log[i] == 0:
-                if not self.len_plats:
-                    self.len_plats.append(0)
-                self.len_plats[-1] += 1
-            if self.log[i] != 0:
-                if not self.len_steps:
-                    self.len_steps.append(0)
-                self.len_steps[-1] += 1
-            if i < len(self.log) - 1:
-                if self.log[i] == 0 and self.log[i + 1] != 0:
-                    self.len_steps.append(0)
-                if self.log[i] != 0 and self.log[i + 1] == 0:
-                    self.len_plats.append(0)
+        self.ix_stepup = self.log == 1
+        self.ix_stepdown = self.log == -1
+
+        # lengths of consecutive runs of plateau (log == 0) and step (log != 0) values
+        step_mask = ~self.ix_plat
+        bounds = np.concatenate(([0], np.flatnonzero(np.diff(step_mask)) + 1, [step_mask.size]))
+        run_lengths = np.diff(bounds).tolist() if step_mask.size else []
+        first_is_step = bool(step_mask.size and step_mask[0])
+        self.len_plats = run_lengths[int(first_is_step) :: 2]
+        self.len_steps = run_lengths[int(not first_is_step) :: 2]
 
         if plot:
-            x_all = np.array(list(range(len(self.values))))
+            x_all = np.arange(len(self.values))
             x_plat = x_all[self.ix_plat]
             _, ax = plt.subplots()
             ax.scatter(x_all, self.values, c=clrs)  # type: ignore
@@ -103,28 +140,42 @@ class SteppedData:
         """Calculate statistical parameters for each of the steps (plateaus) found in the input vector."""
         if self.n_plats == 0:
             raise ValueError("No plateaus found!")
-        for i in range(self.n_plats):
-            ix0 = sum(self.len_plats[0:i]) + plats_cut[0]
-            ix1 = ix0 + self.len_plats[i] - sum(plats_cut)
-            if (ix1 - ix0) >= use_last_n > 0:
-                ix0 = ix1 - use_last_n
-            ix0, ix1 = int(ix0), int(ix1)
-            if ix1 - ix0 >= 1:
-                self.plat_nv.append(len(self.values_plat[ix0:ix1]))
-                self.plat_mean.append(np.mean(self.values_plat[ix0:ix1]))
-                self.plat_median.append(np.median(self.values_plat[ix0:ix1]))
-                if ix1 - ix0 > 1:
-                    self.plat_stddev.append(np.std(self.values_plat[ix0:ix1]))
-                    self.plat_eom.append(self.plat_stddev[-1] / np.sqrt(self.plat_nv[-1]))
-                    self.plat_rsd.append(self.plat_stddev[-1] / self.plat_mean[-1])
-                else:
-                    self.plat_stddev.append(np.nan)
-                    self.plat_eom.append(np.nan)
-            else:
-                self.plat_nv.append(0)
-                self.plat_mean.append(np.nan)
-                self.plat_median.append(np.nan)
-                self.plat_stddev.append(np.nan)
-                self.plat_eom.append(np.nan)
+        n = self.n_plats
+        len_plats = np.asarray(self.len_plats[:n], dtype=np.int64)
+        ix0 = np.cumsum(len_plats) - len_plats + plats_cut[0]
+        ix1 = ix0 + len_plats - sum(plats_cut)
+        if use_last_n > 0:
+            ix0 = np.where(ix1 - ix0 >= use_last_n, ix1 - use_last_n, ix0)
+        nv = np.clip(ix1 - ix0, 0, None)
+
+        # gather the values of all (cut) plateaus into one array,
+        # with the plateau index of each value in seg
+        starts = np.cumsum(nv) - nv
+        seg = np.repeat(np.arange(n), nv)
+        pos = np.arange(seg.size) - np.repeat(starts, nv)
+        vals = np.asarray(self.values_plat, dtype=np.float64)[ix0[seg] + pos]
+
+        sums = np.bincount(seg, weights=vals, minlength=n)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(nv >= 1, sums / nv, np.nan)
+            sqdev = np.bincount(seg, weights=(vals - mean[seg]) ** 2, minlength=n)
+            stddev = np.where(nv > 1, np.sqrt(sqdev / nv), np.nan)
+            eom = stddev / np.sqrt(nv)
+            rsd = stddev / mean
+
+        # median: sort values within each plateau, then pick the middle element(s)
+        median = np.full(n, np.nan)
+        sorted_vals = vals[np.lexsort((vals, seg))]
+        has_v = nv >= 1
+        lo = starts[has_v] + (nv[has_v] - 1) // 2
+        hi = starts[has_v] + nv[has_v] // 2
+        median[has_v] = (sorted_vals[lo] + sorted_vals[hi]) / 2
+
+        self.plat_nv = nv.tolist()
+        self.plat_mean = mean.tolist()
+        self.plat_median = median.tolist()
+        self.plat_stddev = stddev.tolist()
+        self.plat_eom = eom.tolist()
+        self.plat_rsd = rsd.tolist()
 
         return self
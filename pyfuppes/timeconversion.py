@@ -1,15 +1,35 @@
 # -*- coding: utf-8 -*-
 """Convert between types representing date/time."""
 
+import re
 import warnings
 from datetime import datetime, timedelta, timezone
-from operator import attrgetter
 from typing import Any, Optional, Union
 
 import numpy as np
 import numpy.typing as npt
+import pandas as pd
 import xarray as xr
 
+NANOSECONDS_PER_DAY = 86_400_000_000_000
+MICROSECONDS_PER_DAY = 86_400_000_000
+
+# range of datetime.datetime, as datetime64[us]
+_DT64_MIN = np.datetime64(datetime.min, "us")
+_DT64_MAX = np.datetime64(datetime.max, "us")
+
+# strptime directives supported by _compile_strptime_regex, mapped to the
+# same regular expressions that the _strptime module uses
+_STRPTIME_DIRECTIVES = {
+    "Y": r"(?P<Y>\d\d\d\d)",
+    "m": r"(?P<m>1[0-2]|0[1-9]|[1-9])",
+    "d": r"(?P<d>3[01]|[12]\d|0[1-9]|[1-9]| [1-9])",
+    "H": r"(?P<H>2[0-3]|[0-1]\d|\d)",
+    "M": r"(?P<M>[0-5]\d|\d)",
+    "S": r"(?P<S>6[0-1]|[0-5]\d|\d)",
+    "f": r"(?P<f>[0-9]{1,6})",
+}
+
 ### HELPERS ###################################################################
 
 
@@ -20,7 +40,10 @@ def _to_list(
     Convert input "parm" to a Python list object.
 
     If "parm" is a scalar, return value "is_scalar" is True, otherwise False.
+    np.ndarray input is returned as-is.
     """
+    if type(parm) is list or type(parm) is np.ndarray:  # fast path, exact types
+        return parm, is_scalar
     if isinstance(parm, str):  # check this first: don't call list() on a string
         parm, is_scalar = [parm], True
     elif not isinstance(parm, (list, np.ndarray)):
@@ -33,6 +56,117 @@ def _to_list(
     return parm, is_scalar
 
 
+def _isostr_2_mdns(
+    timestrings: Union[list[str], np.ndarray], ymd: Optional[tuple[int, ...]] = None
+) -> Optional[npt.NDArray[np.float64]]:
+    """
+    Convert naive ISO8601 strings to seconds after midnight, using numpy's datetime64 parser.
+
+    The reference date is ymd if specified, else the date of the first element.
+    Returns None if the strings are not all full ISO dates (yyyy-mm-dd...), if numpy
+    cannot parse them, if any parses to NaT, or if they specify a UTC offset (numpy
+    would silently convert to UTC, which shifts the reference date). numpy accepts
+    e.g. "2012", "NaT" or "today", which datetime.fromisoformat rejects.
+    """
+    if not all(
+        len(s) >= 10
+        and s[4] == "-" == s[7]
+        and s[:4].isdigit()
+        and not any(c in s[10:] for c in "+-Zz")  # UTC offset
+        for s in timestrings
+    ):
+        return None
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # anything numpy only warns about is not parsed here
+        try:
+            arr = np.array(timestrings, dtype="datetime64[us]")  # us: no overflow for old dates
+        except (ValueError, Warning):
+            return None
+    if np.isnat(arr).any():
+        return None
+
+    ref = np.datetime64(datetime(*ymd), "D") if ymd else arr[0].astype("datetime64[D]")
+
+    return (arr - ref).astype(np.int64) / 1_000_000
+
+
+def _compile_strptime_regex(tsfmt: str) -> Optional[re.Pattern]:
+    """
+    Translate a strptime format into a compiled regular expression with named groups.
+
+    Only the directives in _STRPTIME_DIRECTIVES (plus "%%") are supported, each at most
+    once; returns None otherwise. Whitespace matches one or more whitespace characters,
+    like in strptime.
+    """
+    parts, seen, i = [], set(), 0
+    while i < len(tsfmt):
+        c = tsfmt[i]
+        if c == "%":
+            if i + 1 == len(tsfmt):
+                return None
+            d = tsfmt[i + 1]
+            if d == "%":
+                parts.append("%")
+            elif d in _STRPTIME_DIRECTIVES and d not in seen:
+                parts.append(_STRPTIME_DIRECTIVES[d])
+                seen.add(d)
+            else:
+                return None
+            i += 2
+        else:
+            parts.append(r"\s+" if c.isspace() else re.escape(c))
+            i += 1
+
+    return re.compile("".join(parts), re.IGNORECASE)
+
+
+def _strptime_list(timestrings: Union[list[str], np.ndarray], tsfmt: str) -> list[datetime]:
+    """
+    Parse a list of strings with a common strptime format to datetime objects.
+
+    The format is compiled once to a regular expression if possible; strings
+    that don't match it are passed to datetime.strptime, e.g. to raise the error.
+    """
+    rx = _compile_strptime_regex(tsfmt)
+    if rx is None:
+        return [datetime.strptime(s, tsfmt) for s in timestrings]
+
+    result = []
+    for s in timestrings:
+        m = rx.fullmatch(s)
+        if m is None:
+            result.append(datetime.strptime(s, tsfmt))
+            continue
+        g = m.groupdict()
+        result.append(
+            datetime(
+                int(g.get("Y", 1900)),
+                int(g.get("m", 1)),
+                int(g.get("d", 1)),
+                int(g.get("H", 0)),
+                int(g.get("M", 0)),
+                int(g.get("S", 0)),
+                int(g["f"].ljust(6, "0")) if "f" in g else 0,
+            )
+        )
+
+    return result
+
+
+def _seconds_2_timedelta64(seconds: np.ndarray) -> np.ndarray:
+    """
+    Convert float seconds to timedelta64[us].
+
+    Rounds to microseconds like datetime.timedelta(seconds=...) does; the fractional
+    part is scaled separately so that the rounding is not affected by the integer part.
+    """
+    frac, whole = np.modf(seconds)
+    us = whole.astype(np.int64) * 1_000_000 + np.round(frac * 1e6).astype(np.int64)
+
+    return us.astype("timedelta64[us]")
+
+
 ### MAIN FUNCTIONS ############################################################
 
 
@@ -45,7 +179,7 @@ def xrtime_to_mdns(xrda: xr.DataArray, dim_name="Time") -> npt.NDArray[np.float6
     xrda : xr.DataArray
         xarray.DataArray to extract time from.
     dim_name : str, optional
-        Attribute name of the time dimension. The default is "Time".
+        Name of the time coordinate. The default is "Time".
 
     Returns
     -------
@@ -53,10 +187,13 @@ def xrtime_to_mdns(xrda: xr.DataArray, dim_name="Time") -> npt.NDArray[np.float6
         time in seconds after midnight (dtype float).
 
     """
-    f = attrgetter(dim_name)
-    t = f(xrda)
+    t = xrda.coords[dim_name].values
 
-    return (t - t[0].dt.floor("d")).values.astype(int) / 1_000_000_000
+    # floor to the date of the first element by integer arithmetic on nanoseconds since the epoch
+    ns = t.astype("datetime64[ns]").view(np.int64)
+    t0 = ns[0] // NANOSECONDS_PER_DAY * NANOSECONDS_PER_DAY
+
+    return (ns - t0) / 1_000_000_000
 
 
 ###############################################################################
@@ -85,17 +222,27 @@ def dtstr_2_mdns(
 
     Returns
     -------
-    float; scalar or float; list
-        seconds since midnight for the given timestring(s).
+    float; scalar or float; list or np.ndarray
+        seconds since midnight for the given timestring(s). np.ndarray input
+        gives np.ndarray output.
     """
+    ret_array = isinstance(timestring, np.ndarray)
     timestring, ret_scalar = _to_list(timestring)
 
     if tsfmt == "iso":
+        # fast path for ISO format without UTC offset; no datetime objects needed
+        mdns = _isostr_2_mdns(timestring, ymd)
+        if mdns is not None:
+            if ret_scalar:
+                return float(mdns[0])
+            return mdns if ret_array else mdns.tolist()
         dts = [datetime.fromisoformat(s) for s in timestring]
     else:
-        dts = [datetime.strptime(s, tsfmt) for s in timestring]
+        dts = _strptime_list(timestring, tsfmt)
+
+    result = dtobj_2_mdns(dts[0] if ret_scalar else dts, ref_date=ymd, ref_is_first=True)
 
-    return dtobj_2_mdns(dts[0] if ret_scalar else dts, ref_date=ymd, ref_is_first=True)
+    return np.array(result) if ret_array else result
 
 
 ###############################################################################
@@ -123,17 +270,35 @@ def dtobj_2_mdns(
 
     Returns
     -------
-    float; scalar or list of float
-        seconds after midnight for the given datetime object(s).
+    float; scalar or list of float or np.ndarray
+        seconds after midnight for the given datetime object(s). np.ndarray input
+        gives np.ndarray output.
     """
+    ret_array = isinstance(dt_obj, np.ndarray)
     dt_obj, ret_scalar = _to_list(dt_obj)
 
-    tzs = [d.tzinfo for d in dt_obj]
-    assert len(set(tzs)) == 1, "all time zones (tzinfo) must be equal."
+    tz0 = dt_obj[0].tzinfo
+    assert all(d.tzinfo == tz0 for d in dt_obj), "all time zones (tzinfo) must be equal."
+
+    if tz0 is None and type(dt_obj[0]) is datetime:
+        # naive datetime: integer arithmetic on microseconds since the epoch.
+        # pandas converts datetime objects in C; much faster than numpy here.
+        us = pd.DatetimeIndex(dt_obj).as_unit("us").asi8
+        if ref_date:
+            t0 = np.datetime64(datetime(*ref_date), "D").astype("datetime64[us]").view(np.int64)
+            us = us - t0
+        elif ref_is_first:
+            us = us - us[0] // MICROSECONDS_PER_DAY * MICROSECONDS_PER_DAY
+        else:
+            us = us % MICROSECONDS_PER_DAY
+        mdns = us / 1_000_000
+        if ret_scalar:
+            return float(mdns[0])
+        return mdns if ret_array else mdns.tolist()
 
     t0 = dt_obj[0]
     if ref_date:
-        t0 = datetime(*ref_date, tzinfo=dt_obj[0].tzinfo)
+        t0 = datetime(*ref_date, tzinfo=tz0)
     t0 = t0.replace(hour=0, minute=0, second=0, microsecond=0)
 
     if ref_is_first or ref_date:
@@ -144,6 +309,8 @@ def dtobj_2_mdns(
             for x in dt_obj
         ]
 
+    if ret_array:
+        return np.array(result)
     return result[0] if ret_scalar else result
 
 
@@ -167,9 +334,11 @@ def unixtime_2_mdns(
 
     Returns
     -------
-    float; scalar or list of float
-        seconds after midnight for the given POSIX timestamp(s).
+    float; scalar or list of float or np.ndarray
+        seconds after midnight for the given POSIX timestamp(s). np.ndarray input
+        gives np.ndarray output.
     """
+    ret_array = isinstance(timestamp, np.ndarray)
     timestamps, ret_scalar = _to_list(timestamp)
 
     # to floor a Unix time to the date, use  t - t % 86400
@@ -181,9 +350,11 @@ def unixtime_2_mdns(
         t0 = datetime.fromtimestamp(timestamps[0], tz=timezone.utc)
         t0 = t0.replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
 
-    ts = [t - t0 for t in timestamps]
+    ts = np.asarray(timestamps, dtype=np.float64) - t0
 
-    return ts[0] if ret_scalar else ts
+    if ret_scalar:
+        return float(ts[0])
+    return ts if ret_array else ts.tolist()
 
 
 ###############################################################################
@@ -221,9 +392,9 @@ def mdns_2_dtobj(
         ...for the given seconds after midnight.
     """
     mdns, ret_scalar = _to_list(mdns)
-    # ensure type float:
-    if not isinstance(mdns[0], (float, np.floating)):
-        mdns = list(map(float, mdns))
+    mdns = np.asarray(mdns, dtype=np.float64)  # ensure type float
+    if not np.isfinite(mdns).all():
+        raise ValueError("mdns must be finite")
 
     # check if ref_date is supplied as a y/m/d tuple. convert to datetime.
     reset_tz = False
@@ -232,7 +403,18 @@ def mdns_2_dtobj(
         if assume_UTC:  # add timezone UTC if assume_UTC is set to True
             ref_date = ref_date.replace(tzinfo=timezone.utc)
 
-    result = [ref_date + timedelta(seconds=t) for t in mdns]
+    # add to naive reference in datetime64; same wall-time arithmetic as
+    # adding a timedelta to a tz-aware datetime. astype(object) gives datetime objects.
+    tz = ref_date.tzinfo
+    # outside the datetime range, astype(object) would give ints, not datetime objects
+    if (np.abs(mdns) > (_DT64_MAX - _DT64_MIN) / np.timedelta64(1, "s")).any():
+        raise OverflowError("date value out of range")
+    result = np.datetime64(ref_date.replace(tzinfo=None), "us") + _seconds_2_timedelta64(mdns)
+    if ((result < _DT64_MIN) | (result > _DT64_MAX)).any():
+        raise OverflowError("date value out of range")
+    result = result.astype(object).tolist()
+    if tz is not None and (posix or str_fmt or not reset_tz):
+        result = [t.replace(tzinfo=tz) for t in result]
 
     if posix:
         if not ref_date.tzinfo:
@@ -245,9 +427,6 @@ def mdns_2_dtobj(
     elif str_fmt:
         offset = -3 if str_fmt.endswith("%f") else None
         result = [dtobj.strftime(str_fmt)[:offset] for dtobj in result]
-    else:
-        if reset_tz:
-            result = [t.replace(tzinfo=None) for t in result]
 
     return result[0] if ret_scalar else result
 
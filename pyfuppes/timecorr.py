@@ -2,14 +2,18 @@
 """Corrections for time in timeseries data."""
 
 import functools
-from copy import deepcopy
-from datetime import timedelta
-from typing import Callable, NamedTuple, Optional
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, NamedTuple, Optional, Union
 
 import numpy as np
+import numpy.typing as npt
 import polars as pl
 import scipy as sc
-from matplotlib import pyplot as plt
+from numba import njit
+
+# moved to numpy.exceptions in numpy 1.25, removed from the main namespace in 2.0
+_RankWarning = getattr(np, "exceptions", np).RankWarning
 
 ###############################################################################
 
@@ -39,15 +43,80 @@ def correct_time(t: np.ndarray, t_ref: np.ndarray, fitorder: int) -> CorrTime:
             'fitparms': parameters of the fit, ndarray
             't_corr': corrected input time vector t
     """
+    if fitorder == 1 and len(t) > 1:
+        # closed-form linear least squares; centered for numerical stability
+        t64 = np.ascontiguousarray(t, dtype=np.float64)
+        delta = t64 - np.asarray(t_ref, dtype=np.float64)
+        t_mean, delta_mean = t64.mean(), delta.mean()
+        t_centered = t64 - t_mean
+        sxx = t_centered @ t_centered
+        if sxx > 0:  # else, all t equal: rank deficient, see below
+            slope = (t_centered @ (delta - delta_mean)) / sxx
+            parms = np.array([slope, delta_mean - slope * t_mean])
+            return CorrTime(parms, _horner_sub(t64, parms))
+
+    # least squares fit like np.polyfit, but keep the Vandermonde matrix to
+    # evaluate the polynomial at t. columns are scaled to improve the condition.
+    vander = np.vander(np.asarray(t) + 0.0, fitorder + 1)
+    scale = np.sqrt(np.einsum("ij,ij->j", vander, vander))  # column norms, no temporary
+    vander /= scale
+    rcond = len(t) * np.finfo(vander.dtype).eps
     try:
-        parms = np.polyfit(t, t - t_ref, fitorder)
+        coef, _, rank, _ = np.linalg.lstsq(vander, t - t_ref, rcond=rcond)
     except np.linalg.LinAlgError:  # sometimes happens at first try...
-        parms = np.polyfit(t, t - t_ref, fitorder)
-    t_corr = t - np.polyval(parms, t)
+        coef, _, rank, _ = np.linalg.lstsq(vander, t - t_ref, rcond=rcond)
+    if rank != fitorder + 1:
+        warnings.warn("Polyfit may be poorly conditioned", _RankWarning, stacklevel=2)
+
+    parms = coef / scale
+    t_corr = t - vander @ coef
 
     return CorrTime(parms, t_corr)
 
 
+@njit(cache=True)
+def _horner_sub(t: np.ndarray, parms: np.ndarray) -> np.ndarray:
+    """
+    Subtract the polynomial with coefficients parms (highest order first) from t.
+
+    Evaluates the polynomial by Horner's method in the same loop.
+    Code gets numba-JIT compiled.
+    """
+    out = np.empty_like(t)
+    for i in range(t.shape[0]):
+        x = t[i]
+        y = parms[0]
+        for k in range(1, parms.shape[0]):
+            y = y * x + parms[k]
+        out[i] = x - y
+
+    return out
+
+
+def apply_time_correction(t: np.ndarray, fitparms: np.ndarray) -> np.ndarray:
+    """
+    Correct a time vector with polynomial parameters, e.g. obtained from correct_time.
+
+    Parameters
+    ----------
+    t : np.ndarray
+        time vector, 1D, numeric type.
+    fitparms : np.ndarray
+        polynomial coefficients, highest order first (as returned by np.polyfit).
+
+    Returns
+    -------
+    np.ndarray
+        t - np.polyval(fitparms, t), dtype float64.
+    """
+    t = np.ascontiguousarray(t, dtype=np.float64)
+    parms = np.ascontiguousarray(fitparms, dtype=np.float64)
+    if parms.size == 0:
+        return t.copy()
+
+    return _horner_sub(t, parms)
+
+
 ###############################################################################
 
 FilteredDt = NamedTuple(
@@ -59,6 +128,46 @@ FilteredDt = NamedTuple(
 )
 
 
+@njit(cache=True)
+def _monotonic_mask(t: np.ndarray, valid: np.ndarray, backward: bool) -> tuple[np.ndarray, int]:
+    """
+    Mask of the elements that make t strictly increasing, and the number of removed elements.
+
+    Forwards, an element is kept if it is greater than all previously kept ones;
+    backwards, if it is less than all subsequently kept ones. Invalid (null) elements
+    are kept and restart the comparison. Single sweep; code gets numba-JIT compiled.
+    """
+    n = t.shape[0]
+    keep = np.zeros(n, dtype=np.bool_)
+    n_removed = 0
+    have_ref, ref = False, t[0] if n else 0
+    for j in range(n):
+        i = n - 1 - j if backward else j
+        if not valid[i]:
+            keep[i] = True
+            have_ref = False
+        elif not have_ref or (t[i] < ref if backward else t[i] > ref):
+            keep[i] = True
+            have_ref, ref = True, t[i]
+        else:
+            n_removed += 1
+
+    return keep, n_removed
+
+
+def _filter_dt(df: pl.DataFrame, datetime_key: str, backward: bool) -> FilteredDt:
+    """Filter df so that column datetime_key is strictly increasing; see filter_dt_forward."""
+    s = df[datetime_key]
+    # the validity mask is costly to convert from polars' bitmap; only needed with nulls
+    if s.null_count():
+        t, valid = s.to_physical().fill_null(0).to_numpy(), s.is_not_null().to_numpy()
+    else:
+        t, valid = s.to_physical().to_numpy(), np.ones(s.len(), dtype=np.bool_)
+    keep, n_removed = _monotonic_mask(t, valid, backward)
+
+    return FilteredDt(int(n_removed), df.filter(pl.Series(keep)) if n_removed else df)
+
+
 def filter_dt_forward(df: pl.DataFrame, datetime_key: str = "datetime") -> FilteredDt:
     """
     Given a time series as polars.DataFrame, ensure that the index is increasing strictly.
@@ -78,19 +187,7 @@ def filter_dt_forward(df: pl.DataFrame, datetime_key: str = "datetime") -> Filte
     (n, df) : (int, polars DataFrame)
         The number of removed columns and the filtered dataframe.
     """
-    fill_value = timedelta(microseconds=1)
-    ref_value = timedelta(0)
-    n_removed = 0
-
-    m = df[datetime_key].diff().fill_null(fill_value) > ref_value
-    while not m.all():
-        if df.height == 1:
-            return (int(n_removed), df)
-        df = df.filter(m)
-        n_removed += (~m).sum()
-        m = df[datetime_key].diff().fill_null(fill_value) > ref_value
-
-    return FilteredDt(int(n_removed), df)
+    return _filter_dt(df, datetime_key, backward=False)
 
 
 # -----------------------------------------------------------------------------
@@ -102,22 +199,262 @@ def filter_dt_backward(df: pl.DataFrame, datetime_key: str = "datetime") -> Filt
 
     If one element is less than the previous, then the previous element is removed.
     """
-    fill_value = timedelta(microseconds=1)
-    ref_value = timedelta(0)
-    n_removed = 0
+    return _filter_dt(df, datetime_key, backward=True)
 
-    m = (df[datetime_key].diff().fill_null(fill_value) > ref_value).shift(-1).fill_null(True)
-    while not m.all():
-        if df.height == 1:
-            return (int(n_removed), df)
-        df = df.filter(m)
-        n_removed += (~m).sum()
-        m = (df[datetime_key].diff().fill_null(fill_value) > ref_value).shift(-1).fill_null(True)
 
-    return FilteredDt(int(n_removed), df)
+###############################################################################
 
 
-###############################################################################
+@njit(cache=True)
+def _clip_and_clean(
+    x: np.ndarray, y: np.ndarray, lo: float, hi: float, rmv_nan: bool
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Select x, y where lo <= x < hi (and y is finite, if rmv_nan), in a single pass.
+
+    Returns views of new buffers, so the input is never modified.
+    Code gets numba-JIT compiled.
+    """
+    x_out, y_out = np.empty_like(x), np.empty_like(y)
+    j = 0
+    for i in range(x.shape[0]):
+        if lo <= x[i] < hi and (not rmv_nan or np.isfinite(y[i])):
+            x_out[j], y_out[j] = x[i], y[i]
+            j += 1
+
+    return x_out[:j], y_out[:j]
+
+
+@njit(cache=True, error_model="numpy")  # division by zero gives inf/NaN, as in numpy
+def _prep_series(
+    x: np.ndarray,
+    y: np.ndarray,
+    lo: float,
+    hi: float,
+    rmv_nan: bool,
+    pad_to_zero: bool,
+    normalize: bool,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Select lo <= x < hi (and finite y), subtract the median of y and divide by the max.
+
+    Median and max are computed on the selection and ignore NaN, like np.nanmedian /
+    np.nanmax; y is then shifted and scaled in place. Code gets numba-JIT compiled.
+    """
+    x_out, y_out = _clip_and_clean(x, y, lo, hi, rmv_nan)
+    if not (pad_to_zero or normalize):
+        return x_out, y_out
+
+    shift = np.nanmedian(y_out) if pad_to_zero else 0.0
+    scale = np.nanmax(y_out) - shift if normalize else 1.0
+    for j in range(y_out.shape[0]):
+        y_out[j] = (y_out[j] - shift) / scale
+
+    return x_out, y_out
+
+
+def _interp_extrap(x_new: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Linearly interpolate y(x) at x_new, extrapolating linearly beyond the ends of x.
+
+    Same result as scipy.interpolate.interp1d(x, y, fill_value="extrapolate")(x_new),
+    without the interpolator object. x_new must be sorted in ascending order, so
+    the extrapolated parts are a prefix and a suffix of it.
+    """
+    if np.any(x[1:] < x[:-1]):
+        order = np.argsort(x)
+        x, y = x[order], y[order]
+
+    if x.size < 2:
+        return np.interp(x_new, x, y)
+
+    i0 = np.searchsorted(x_new, x[0], side="left")
+    i1 = np.searchsorted(x_new, x[-1], side="right")
+    result = np.empty(x_new.size)
+    result[i0:i1] = np.interp(x_new[i0:i1], x, y)
+    result[:i0] = y[0] + (x_new[:i0] - x[0]) * (y[1] - y[0]) / (x[1] - x[0])
+    result[i1:] = y[-1] + (x_new[i1:] - x[-1]) * (y[-1] - y[-2]) / (x[-1] - x[-2])
+
+    return result
+
+
+@functools.lru_cache(maxsize=128)
+def _fft_len(n: int) -> int:
+    """Fast length for a real FFT of (at least) n samples."""
+    return sc.fft.next_fast_len(n, real=True)
+
+
+def xcorr_fft(f: np.ndarray, g: np.ndarray, workers: Optional[int] = -1) -> np.ndarray:
+    """
+    Cross-correlate f and g via real FFTs; full output like scipy.signal.correlate(f, g).
+
+    Correlates along the last axis, so 2D input gives the cross-correlations of
+    all rows (broadcasting f against g) from a single FFT call.
+
+    The transforms go through scipy.fft, so another FFT backend can be used
+    with scipy.fft.set_backend, e.g. pyfftw.interfaces.scipy_fft.
+
+    Parameters
+    ----------
+    f, g : np.ndarray
+        signals to correlate, 1D or 2D (one signal per row).
+    workers : int, optional
+        number of workers for scipy.fft; parallelizes over rows of 2D input.
+        The default is -1, i.e. all CPU cores. None uses the setting of an
+        enclosing scipy.fft.set_workers context.
+
+    Returns
+    -------
+    np.ndarray
+        cross-correlation, f.shape[-1] + g.shape[-1] - 1 elements along the last axis.
+    """
+    n_f, n_g = f.shape[-1], g.shape[-1]
+    n = n_f + n_g - 1
+    if f.ndim == 1 and g.ndim == 1 and n < 256:
+        # FFT overhead dominates for short input
+        return np.correlate(f, g, mode="full")
+
+    nfft = _fft_len(n)
+    # rfft zero-pads to nfft itself; the spectral product is formed in place
+    spec_g = sc.fft.rfft(g, nfft, workers=workers)
+    np.conjugate(spec_g, out=spec_g)
+    spec = sc.fft.rfft(f, nfft, workers=workers)
+    if spec.shape == np.broadcast_shapes(spec.shape, spec_g.shape):
+        spec *= spec_g
+    else:
+        spec = spec * spec_g
+    c = sc.fft.irfft(spec, nfft, workers=workers)
+
+    # negative lags wrap around to the end of the circular correlation
+    return np.concatenate((c[..., nfft - (n_g - 1) :], c[..., :n_f]), axis=-1)
+
+
+def _delay_full(k: Union[int, np.ndarray], size: int, start: float, end: float):
+    """Delay at index k of the full output of scipy.signal.correlate / xcorr_fft."""
+    return (k + 1 - size) * (end - start) / size * -1
+
+
+def _delay_arr_full(n: float, upscale: int, start: float, end: float, size: int) -> np.ndarray:
+    """Delays corresponding to the full output of scipy.signal.correlate / xcorr_fft."""
+    return _delay_full(np.arange(2 * size - 1), size, start, end)
+
+
+def _boundary_slice_full(
+    boundaries: tuple[float, float], size: int, start: float, end: float
+) -> slice:
+    """
+    Same as _boundary_slice(_delay_arr_full(...), boundaries), without the delay array.
+
+    The index bounds are estimated from the closed form of the (decreasing) delays,
+    then checked against the delays at the neighbouring indices.
+    """
+    m, step = 2 * size - 1, (end - start) / size
+
+    def first_below(v: float) -> int:  # smallest index with delay < v
+        k = int(np.clip(np.floor(size - 1 - v / step), 0, m))
+        while k > 0 and _delay_full(k - 1, size, start, end) < v:
+            k -= 1
+        while k < m and _delay_full(k, size, start, end) >= v:
+            k += 1
+        return k
+
+    return slice(first_below(boundaries[1]), first_below(boundaries[0]))
+
+
+# supported correlation functions; output like np.correlate / scipy.signal.correlate
+_XCORR_FUNCS = (np.correlate, sc.signal.correlate, xcorr_fft)
+
+
+def _full_offset(n_out: int, size: int) -> int:
+    """
+    Index in the full correlation of input of length size, of the first of n_out output values.
+
+    Modes "same" and "valid" of np.correlate and scipy.signal.correlate give the centred
+    n_out values of the full output (2*size-1 values).
+    """
+    n_full = 2 * size - 1
+    if not 0 < n_out <= n_full:
+        raise ValueError(f"correlation has {n_out} elements, expected 1 to {n_full}")
+
+    return (n_full - n_out) // 2
+
+
+def _boundary_slice(delay_arr: np.ndarray, boundaries: tuple[float, float]) -> slice:
+    """
+    Slice of the (decreasing) delay_arr with boundaries[0] <= delay < boundaries[1].
+
+    Found by binary search on the reversed view, no mask needed.
+    """
+    j0, j1 = np.searchsorted(delay_arr[::-1], boundaries, side="left")
+
+    return slice(delay_arr.size - j1, delay_arr.size - j0)
+
+
+def _select_func(corrmode: str, f: np.ndarray, g: np.ndarray) -> Callable:
+    """np.argmax or np.argmin, to find the correlation peak for the given corrmode."""
+    assert corrmode in ("auto", "negative", "positive")
+    if corrmode == "negative":
+        return np.argmin
+    if corrmode == "positive":
+        return np.argmax
+
+    # only the sign of the correlation coefficient matters, so the
+    # covariance (without normalization by the standard deviations) suffices
+    return np.argmax if np.dot(f - f.mean(), g - g.mean()) > 0 else np.argmin
+
+
+def _find_peak(select: Callable, corr: np.ndarray, stride: Optional[int] = None) -> int:
+    """
+    Index of the peak of corr, as given by select (np.argmax or np.argmin).
+
+    If stride is set, search every stride-th value first, then refine at full
+    resolution within one stride around the coarse peak.
+    """
+    if not stride or stride < 2 or corr.size <= 4 * stride:
+        return int(select(corr))
+
+    coarse = int(select(corr[::stride])) * stride
+    lo, hi = max(coarse - stride, 0), min(coarse + stride + 1, corr.size)
+
+    return lo + int(select(corr[lo:hi]))
+
+
+def _plot_xcorr_result(
+    x1: np.ndarray,
+    y1: np.ndarray,
+    x2: np.ndarray,
+    y2: np.ndarray,
+    xnorm: np.ndarray,
+    f: np.ndarray,
+    g: np.ndarray,
+    delay_arr: np.ndarray,
+    corr: np.ndarray,
+    delay: float,
+    ynames: tuple[str, str],
+) -> None:
+    """Plot input, resampled data and cross-correlation of xcorr_timelag."""
+    from matplotlib import pyplot as plt  # only needed here; slow to import
+
+    _, ax = plt.subplots(2, 1, figsize=(14, 10))
+    plt.subplots_adjust(top=0.94, bottom=0.06, left=0.06, right=0.94)
+    p0 = ax[0].plot(x1, y1, "r", label=f"{ynames[0]}")
+    ax[0].set_xlabel("x", weight="bold")
+    ax[0].set_ylabel(f"{ynames[0]} normalized")
+    ax[0].set_title("input")
+    ax1 = ax[0].twinx()
+    p1 = ax1.plot(x2, y2, "b", label=f"{ynames[1]}")
+    ax1.set_ylabel(f"{ynames[1]} normalized")
+    p2 = ax[0].plot(xnorm, f, "firebrick", label=f"{ynames[0]} resampled")  # type: ignore
+    p3 = ax1.plot(xnorm, g, "deepskyblue", label=f"{ynames[1]} resampled")  # type: ignore
+    plots = p0 + p1 + p2 + p3  # type: ignore
+    lbls = [p.get_label() for p in plots]
+    ax[0].legend(plots, lbls, loc=0, framealpha=1, facecolor="white")  # type: ignore
+    ax[1].plot(delay_arr, corr, "k", label="xcorr")  # type: ignore
+    ax[1].axvline(x=delay, color="r", linewidth=2)  # type: ignore
+    ax[1].set_xlabel("lag")  # type: ignore
+    ax[1].set_ylabel("correlation coefficient")  # type: ignore
+    ax[1].set_title(f"{ynames[1]} vs. {ynames[0]} lag: {delay:+.3f}")  # type: ignore
+    plt.show()
 
 
 def xcorr_timelag(
@@ -135,7 +472,9 @@ def xcorr_timelag(
     ynames: tuple[str, str] = ("f", "g"),
     corrmode: str = "positive",
     boundaries: Optional[tuple[float, float]] = None,
-    xcorr_func: Callable = sc.signal.correlate,
+    xcorr_func: Callable = xcorr_fft,
+    dtype: Optional[npt.DTypeLike] = None,
+    peak_stride: Optional[int] = None,
 ) -> float:
     """
     Analyze time lag between two time series f and g by cross-correlation.
@@ -171,40 +510,39 @@ def xcorr_timelag(
     boundaries: 2-element tuple. lower and upper boundary.
         expect timelag to fall within these boundaries. The default is None.
     xcorr_func : func, optional
-        function to calculate cross-correlation. The default is scipy.signal.correlate.
+        function to calculate cross-correlation. The default is FFT-based
+        cross-correlation, with the same output as scipy.signal.correlate
+        (direct computation for short input). Also accepts np.correlate and
+        scipy.signal.correlate, or a functools.partial of these,
+        e.g. to pass scipy's method="auto" or the mode ("full", "same" or "valid").
+    dtype : numpy dtype, optional
+        floating point type for y data and cross-correlation. The default is None,
+        which means float32 if both y1 and y2 are float32, float64 otherwise.
+        x data is always processed as float64, so the precision of the lag is kept.
+    peak_stride : int, optional
+        if set, search the correlation peak coarse-to-fine: first on every
+        peak_stride-th value, then at full resolution around the coarse peak.
+        Touches far fewer values for long correlations, but assumes a single
+        dominant, smooth peak. The default is None, i.e. search all values.
 
     Returns
     -------
     delay : float
         time delay of f vs. g in the unit of the input's independent variable.
     """
-    # copy x and y so that nothing gets messed up
-    x1, y1 = deepcopy(x1.astype(float)), deepcopy(y1.astype(float))
-    x2, y2 = deepcopy(x2.astype(float)), deepcopy(y2.astype(float))
+    if dtype is None:
+        dtype = np.result_type(y1, y2, np.float32)
+    x1, y1 = np.ascontiguousarray(x1, dtype=float), np.ascontiguousarray(y1, dtype=dtype)
+    x2, y2 = np.ascontiguousarray(x2, dtype=float), np.ascontiguousarray(y2, dtype=dtype)
 
-    # cut to selected xrange:
+    # cut to selected xrange, remove NaN, pad to zero and normalize.
+    # the kernel writes to new arrays, so the input arrays are not modified.
     if xrange is None:
         xrange = (x1.min(), x2.max())
 
-    m1 = (x1 >= xrange[0]) & (x1 < xrange[1])
-    x1, y1 = x1[m1], y1[m1]
-    m2 = (x2 >= xrange[0]) & (x2 < xrange[1])
-    x2, y2 = x2[m2], y2[m2]
-
-    if rmv_NaN:
-        m1 = np.isfinite(y1)
-        y1, x1 = y1[m1], x1[m1]
-        m2 = np.isfinite(y2)
-        y2, x2 = y2[m2], x2[m2]
-
-    if pad_to_zero:
-        y1 -= np.nanmedian(y1)
-        y2 -= np.nanmedian(y2)
-
-    # this will fail if either one of the arrays holds no elements:
-    if normalize_y:
-        y1 /= np.nanmax(y1)
-        y2 /= np.nanmax(y2)
+    lo, hi = float(xrange[0]), float(xrange[1])
+    x1, y1 = _prep_series(x1, y1, lo, hi, rmv_NaN, pad_to_zero, normalize_y)
+    x2, y2 = _prep_series(x2, y2, lo, hi, rmv_NaN, pad_to_zero, normalize_y)
 
     # normalize x:
     start, end = np.floor(x1[0]), np.ceil(x1[-1])
@@ -212,77 +550,234 @@ def xcorr_timelag(
     xnorm = np.linspace(start, end, num=int(n), endpoint=False)
 
     # interpolate y1 and y2 to xnorm:
-    f_ip = sc.interpolate.interp1d(
-        x1, y1, kind="linear", bounds_error=False, fill_value="extrapolate"
-    )
-    f = f_ip(xnorm)
-    f_ip = sc.interpolate.interp1d(
-        x2, y2, kind="linear", bounds_error=False, fill_value="extrapolate"
-    )
-    g = f_ip(xnorm)
+    f = _interp_extrap(xnorm, x1, y1).astype(dtype, copy=False)
+    g = _interp_extrap(xnorm, x2, y2).astype(dtype, copy=False)
 
     # cross-correlate f vs. g (i.e. y1 vs. y2):
     corr = xcorr_func(f, g)
 
     # need to know used correl function to make delay array...
-    # check first if functools.partial was used.
-    usedfunc = xcorr_func.func if xcorr_func.__class__ == functools.partial else xcorr_func  # type: ignore
-    # if usedfunc.__code__ == np.correlate.__code__:
-    #     delay_arr = np.linspace(-0.5 * n / upscale, 0.5 * n / upscale, int(n))[::-1]
-    # elif usedfunc.__code__ == sc.signal.correlate.__code__:
-    #     delay_arr = np.arange(1 - xnorm.size, xnorm.size) * (end - start) / xnorm.size * -1
-    if usedfunc == np.correlate:
-        delay_arr = np.linspace(-0.5 * n / upscale, 0.5 * n / upscale, int(n))[::-1]
-    elif usedfunc == sc.signal.correlate:
-        delay_arr = np.arange(1 - xnorm.size, xnorm.size) * (end - start) / xnorm.size * -1
-    else:
+    # unwrap functools.partial first.
+    usedfunc = getattr(xcorr_func, "func", xcorr_func)
+    if not any(usedfunc is func for func in _XCORR_FUNCS):
         raise ValueError(f"unknown correl func: {repr(usedfunc)}")
-
-    if boundaries:
-        m = (delay_arr >= boundaries[0]) & (delay_arr < boundaries[1])
-        delay_arr = delay_arr[m]
-        corr = corr[m]
+    # the output is (a centred part of) the full correlation
+    offset = _full_offset(corr.size, xnorm.size)
 
     # check if correlation is positive or negative to determine lag time
-    assert corrmode in ("auto", "negative", "positive")
-    if corrmode == "negative":
-        select = np.argmin
-    elif corrmode == "positive":
-        select = np.argmax
-    else:
-        select = (np.argmin, np.argmax)[int(np.ceil(np.corrcoef(f, g)[0, 1]))]
+    select = _select_func(corrmode, f, g)
 
-    delay = delay_arr[select(corr)]
+    if not show_plots:
+        # the delays have a closed form; no need for the delay array
+        sel = slice(0, corr.size)
+        if boundaries:
+            full = _boundary_slice_full(boundaries, xnorm.size, start, end)
+            lo, hi = (min(max(k - offset, 0), corr.size) for k in (full.start, full.stop))
+            sel = slice(lo, hi)
+        ix = sel.start + _find_peak(select, corr[sel], peak_stride)
+        return _delay_full(ix + offset, xnorm.size, start, end)
+
+    delay_arr = _delay_full(np.arange(offset, offset + corr.size), xnorm.size, start, end)
+
+    if boundaries:
+        sel = _boundary_slice(delay_arr, boundaries)
+        delay_arr, corr = delay_arr[sel], corr[sel]
+
+    delay = delay_arr[_find_peak(select, corr, peak_stride)]
 
     if show_plots:
-        _, ax = plt.subplots(2, 1, figsize=(14, 10))
-        plt.subplots_adjust(top=0.94, bottom=0.06, left=0.06, right=0.94)
-        p0 = ax[0].plot(x1, y1, "r", label=f"{ynames[0]}")
-        ax[0].set_xlabel("x", weight="bold")
-        ax[0].set_ylabel(f"{ynames[0]} normalized")
-        ax[0].set_title("input")
-        ax1 = ax[0].twinx()
-        p1 = ax1.plot(x2, y2, "b", label=f"{ynames[1]}")
-        ax1.set_ylabel(f"{ynames[1]} normalized")
-        p2 = ax[0].plot(xnorm, f, "firebrick", label=f"{ynames[0]} resampled")  # type: ignore
-        p3 = ax1.plot(xnorm, g, "deepskyblue", label=f"{ynames[1]} resampled")  # type: ignore
-        plots = p0 + p1 + p2 + p3  # type: ignore
-        lbls = [p.get_label() for p in plots]
-        ax[0].legend(plots, lbls, loc=0, framealpha=1, facecolor="white")  # type: ignore
-        ax[1].plot(delay_arr, corr, "k", label="xcorr")  # type: ignore
-        ax[1].axvline(x=delay, color="r", linewidth=2)  # type: ignore
-        ax[1].set_xlabel("lag")  # type: ignore
-        ax[1].set_ylabel("correlation coefficient")  # type: ignore
-        ax[1].set_title(f"{ynames[1]} vs. {ynames[0]} lag: {delay:+.3f}")  # type: ignore
-        plt.show()
+        _plot_xcorr_result(x1, y1, x2, y2, xnorm, f, g, delay_arr, corr, delay, ynames)
 
     return delay
 
 
+def xcorr_timelag_map(
+    pairs: Iterable[tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]],
+    max_workers: Optional[int] = None,
+    **kwargs,
+) -> np.ndarray:
+    """
+    Run xcorr_timelag for many pairs of time series in parallel processes.
+
+    Parameters
+    ----------
+    pairs : iterable of 4-element tuples
+        (x1, y1, x2, y2) for each call of xcorr_timelag.
+    max_workers : int, optional
+        number of worker processes. The default is None, i.e. the number of CPUs.
+        Set to 1 to run sequentially in the current process.
+    **kwargs
+        passed to xcorr_timelag, except show_plots which is always False.
+
+    Returns
+    -------
+    np.ndarray
+        time delay for each pair.
+    """
+    pairs = list(pairs)
+    if not pairs:
+        return np.array([], dtype=float)
+
+    func = functools.partial(xcorr_timelag, **(kwargs | {"show_plots": False}))
+    args = list(zip(*pairs))
+    if max_workers == 1:
+        return np.array(list(map(func, *args)), dtype=float)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return np.array(list(executor.map(func, *args)), dtype=float)
+
+
+###############################################################################
+
+XcorrPlan = NamedTuple(
+    "xcorr_plan",
+    [
+        ("sel1", slice),
+        ("sel2", slice),
+        ("ix1", np.ndarray),
+        ("w1", np.ndarray),
+        ("ix2", np.ndarray),
+        ("w2", np.ndarray),
+        ("xnorm", np.ndarray),
+        ("delay_arr", np.ndarray),
+    ],
+)
+
+
+def _interp_weights(x_new: np.ndarray, x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Indices and weights for linear interpolation (and extrapolation) from x to x_new.
+
+    y(x_new) = y[ix] + w * (y[ix + 1] - y[ix]), for any y on the strictly increasing x.
+    """
+    if x.size < 2:
+        raise ValueError("need at least 2 elements of x within xrange")
+    ix = np.clip(np.searchsorted(x, x_new, side="right") - 1, 0, x.size - 2)
+
+    return ix, (x_new - x[ix]) / (x[ix + 1] - x[ix])
+
+
+def xcorr_plan(
+    x1: np.ndarray,
+    x2: np.ndarray,
+    xrange: Optional[tuple[float, float]] = None,
+    upscale: int = 100,
+) -> XcorrPlan:
+    """
+    Precompute the x-dependent part of xcorr_timelag, for use with xcorr_timelag_apply.
+
+    Worth it if many pairs of y data share the same x data (e.g. multiple channels
+    of an instrument): the selection of xrange, the resampled x and the interpolation
+    weights are only computed once.
+
+    Parameters
+    ----------
+    x1, x2 : 1d arrays
+        independent variable of reference data and data to check for time lag;
+        must be strictly increasing.
+    xrange : tuple, optional.
+        cut data to fall within x-range "xrange". The default is (x1.min(), x2.max())
+    upscale : numeric, scalar value
+        upscale the data frequency by factor of upscale. The default is 100.
+
+    Returns
+    -------
+    XcorrPlan
+    """
+    x1, x2 = np.ascontiguousarray(x1, dtype=float), np.ascontiguousarray(x2, dtype=float)
+    if np.any(x1[1:] <= x1[:-1]) or np.any(x2[1:] <= x2[:-1]):
+        raise ValueError("x1 and x2 must be strictly increasing")
+    if xrange is None:
+        xrange = (x1[0], x2[-1])
+
+    # x is sorted, so xrange selects a slice; y data can then be cut without a copy
+    sel1 = slice(*np.searchsorted(x1, xrange, side="left"))
+    sel2 = slice(*np.searchsorted(x2, xrange, side="left"))
+    x1, x2 = x1[sel1], x2[sel2]
+
+    start, end = np.floor(x1[0]), np.ceil(x1[-1])
+    n = (end - start) * upscale
+    xnorm = np.linspace(start, end, num=int(n), endpoint=False)
+
+    ix1, w1 = _interp_weights(xnorm, x1)
+    ix2, w2 = _interp_weights(xnorm, x2)
+
+    return XcorrPlan(
+        sel1, sel2, ix1, w1, ix2, w2, xnorm, _delay_arr_full(n, upscale, start, end, xnorm.size)
+    )
+
+
+def xcorr_timelag_apply(
+    plan: XcorrPlan,
+    y1: np.ndarray,
+    y2: np.ndarray,
+    pad_to_zero: bool = True,
+    normalize_y: bool = True,
+    corrmode: str = "positive",
+    boundaries: Optional[tuple[float, float]] = None,
+    dtype: Optional[npt.DTypeLike] = None,
+    peak_stride: Optional[int] = None,
+) -> Union[float, np.ndarray]:
+    """
+    Analyze time lag between y1 and y2 by cross-correlation, on the x data of a plan.
+
+    Same as xcorr_timelag with xcorr_fft, but y data must not contain NaN
+    (removing them would change the x data of the plan). y1 and / or y2 can be 2D,
+    one series per row; all rows are then cross-correlated with a single FFT call.
+
+    Parameters
+    ----------
+    plan : XcorrPlan
+        the x data of y1 and y2, from xcorr_plan.
+    y1, y2 : 1d or 2d arrays
+        dependent variable of reference data and data to check for time lag.
+    pad_to_zero, normalize_y, corrmode, boundaries, dtype, peak_stride :
+        see xcorr_timelag.
+
+    Returns
+    -------
+    delay : float or np.ndarray
+        time delay of y2 vs. y1; an array with one element per row for 2D input.
+    """
+    if dtype is None:
+        dtype = np.result_type(y1, y2, np.float32)
+    y1 = np.asarray(y1, dtype=dtype)[..., plan.sel1]
+    y2 = np.asarray(y2, dtype=dtype)[..., plan.sel2]
+
+    if pad_to_zero:
+        y1 = y1 - np.median(y1, axis=-1, keepdims=True)
+        y2 = y2 - np.median(y2, axis=-1, keepdims=True)
+    if normalize_y:
+        y1 = y1 / y1.max(axis=-1, keepdims=True)
+        y2 = y2 / y2.max(axis=-1, keepdims=True)
+
+    f = (y1[..., plan.ix1] + plan.w1 * np.diff(y1, axis=-1)[..., plan.ix1]).astype(dtype)
+    g = (y2[..., plan.ix2] + plan.w2 * np.diff(y2, axis=-1)[..., plan.ix2]).astype(dtype)
+
+    corr = xcorr_fft(f, g)
+    delay_arr = plan.delay_arr
+    if boundaries:
+        sel = _boundary_slice(delay_arr, boundaries)
+        delay_arr, corr = delay_arr[sel], corr[..., sel]
+
+    if corr.ndim == 1:
+        return float(delay_arr[_find_peak(_select_func(corrmode, f, g), corr, peak_stride)])
+
+    f, g = np.broadcast_arrays(np.atleast_2d(f), np.atleast_2d(g))
+    return np.array(
+        [
+            delay_arr[_find_peak(_select_func(corrmode, f[i], g[i]), corr[i], peak_stride)]
+            for i in range(corr.shape[0])
+        ]
+    )
+
+
 ###############################################################################
 
 
 if __name__ == "__main__":
+    from matplotlib import pyplot as plt
+
     # illustration of time_correction():
     order = 1
     t = np.array([1, 2, 3, 4, 5, 6], dtype=float)
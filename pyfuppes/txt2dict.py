@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
 """Text file to dictionary."""
 
+from itertools import chain, islice
 from pathlib import Path
 from typing import NamedTuple, Union
 
+import numpy as np
+
 ###############################################################################
 
 
@@ -30,6 +33,14 @@ def txt_2_dict_basic(
     if offset > 0:
         data = data[offset:]
 
+    # fast path, if all lines have the same number of fields and none is empty:
+    # split the whole content at once and take every n-th field as a column.
+    n = data[0].count(delimiter) + 1 if data else 0
+    if data and all(line.count(delimiter) == n - 1 for line in data):
+        fields = delimiter.join(data).split(delimiter)
+        if "" not in fields:
+            return {fields[j]: fields[j + n :: n] for j in range(n)}
+
     separated = []
     for line in data:
         separated.append([v for v in line.split(delimiter) if v])
@@ -39,12 +50,13 @@ def txt_2_dict_basic(
 
 ###############################################################################
 
+
 CsvData = NamedTuple(
     "csv_data",
     [
         ("src", str),
         ("file_hdr", list[str]),
-        ("data", dict[str, list[str]]),
+        ("data", dict[str, Union[list[str], np.ndarray]]),
     ],
 )
 
@@ -59,6 +71,8 @@ def txt_2_dict(
     keys_upper: bool = False,
     preserve_empty: bool = True,
     skip_empty_lines: bool = False,
+    strip_values: bool = True,
+    to_float: bool = False,
 ) -> CsvData:
     """
     Read csv with header.
@@ -78,60 +92,88 @@ def txt_2_dict(
     keys_upper          - convert key name (from column header) to upper-case
     preserve_empty      - do not remove empty fields
     skip_empty_lines    - ignore empty lines, just skip them
+    strip_values        - remove leading and trailing whitespace from values;
+                          can be turned off for speed if the data has none
+    to_float            - convert values to float; columns are then numpy arrays
+                          (float64). All values must be numeric.
 
     Returns:
       NamedTuple 'CsvData';
         .src      - file path, str
         .file_hdr - file header (if any), list of str
-        .data     - dict[str list[str]]
+        .data     - dict[str list[str]], or dict[str np.ndarray] if to_float
     """
 
     with open(file, "r", encoding=encoding) as file_obj:
-        content = file_obj.readlines()
+        content = list(islice(file_obj, colhdr_ix + 1))
+        if not content:
+            raise ValueError(f"no content in {file}")
 
-    if not content:
-        raise ValueError(f"no content in {file}")
+        result = {
+            "file_hdr": [],
+            "data": {},
+            "src": file if isinstance(file, str) else file.as_posix(),
+        }
 
-    result = {"file_hdr": [], "data": {}, "src": file if isinstance(file, str) else file.as_posix()}
+        if colhdr_ix > 0:
+            result["file_hdr"] = [line.strip() for line in content[:colhdr_ix]]
 
-    if colhdr_ix > 0:
-        result["file_hdr"] = [line.strip() for line in content[:colhdr_ix]]
+        col_hdr = content[colhdr_ix].strip().rsplit(delimiter)
+        if ignore_repeated_sep:
+            col_hdr = [s for s in col_hdr if s != ""]
+        if ignore_colhdr:
+            for i, _ in enumerate(col_hdr):
+                col_hdr[i] = f"col_{(i+1):03d}"
 
-    col_hdr = content[colhdr_ix].strip().rsplit(delimiter)
-    if ignore_repeated_sep:
-        col_hdr = [s for s in col_hdr if s != ""]
-    if ignore_colhdr:
-        for i, _ in enumerate(col_hdr):
-            col_hdr[i] = f"col_{(i+1):03d}"
+        if keys_upper:
+            col_hdr = [s.upper() for s in col_hdr]
 
-    if keys_upper:
-        col_hdr = [s.upper() for s in col_hdr]
+        for element in col_hdr:
+            result["data"][element] = []
 
-    for element in col_hdr:
-        result["data"][element] = []
+        # the remaining lines are parsed as they are read from the file
+        lines = file_obj
+        if ignore_colhdr:  # ...column header line is data
+            colhdr_ix -= 1
+            lines = chain(content[-1:], file_obj)
 
-    if ignore_colhdr:  # cut col header...
-        colhdr_ix -= 1
+        n_cols, rows = len(col_hdr), []
+        for ix, line in enumerate(lines):
+            line = line.strip("\n")
+            if not preserve_empty:
+                line = line.strip(delimiter)
 
-    content = content[1 + colhdr_ix :]
-    for ix, line in enumerate(content):
-        line = line.strip("\n")
-        if not preserve_empty:
-            line = line.strip(delimiter)
+            if skip_empty_lines and line == "":  # skip empty lines
+                continue
 
-        if skip_empty_lines and line == "":  # skip empty lines
-            continue
+            line = line.rsplit(delimiter)
 
-        line = line.rsplit(delimiter)
+            if ignore_repeated_sep:
+                line = [s for s in line if s != ""]
 
-        if ignore_repeated_sep:
-            line = [s for s in line if s != ""]
+            if len(line) != n_cols:
+                err_msg = f"{len(line)} elements in line {ix + 1 + colhdr_ix} != {n_cols} elem in col header ({file}).\nLine content: {line}"
+                raise ValueError(err_msg)
 
-        if len(line) != len(col_hdr):
-            err_msg = f"{len(line)} elements in line {ix + 1 + colhdr_ix} != {len(col_hdr)} elem in col header ({file}).\nLine content: {line}"
-            raise ValueError(err_msg)
+            rows.append(line)
 
+    if len(result["data"]) == n_cols:
+        # one list comprehension per column, instead of appending value by value
         for i, hdr_tag in enumerate(col_hdr):
-            result["data"][hdr_tag].append(line[i].strip())
+            if to_float:  # float() ignores surrounding whitespace
+                result["data"][hdr_tag] = np.fromiter(
+                    (float(line[i]) for line in rows), dtype=np.float64, count=len(rows)
+                )
+            elif strip_values:
+                result["data"][hdr_tag] = [line[i].strip() for line in rows]
+            else:
+                result["data"][hdr_tag] = [line[i] for line in rows]
+    else:  # duplicate column names; their values go to the same list
+        cols = [result["data"][hdr_tag] for hdr_tag in col_hdr]
+        for line in rows:
+            for col, value in zip(cols, line):
+                col.append(value.strip() if strip_values else value)
+        if to_float:
+            result["data"] = {k: np.array(v, dtype=np.float64) for k, v in result["data"].items()}
 
     return CsvData(result["src"], result["file_hdr"], result["data"])
@@ -1,16 +1,18 @@
 # -*- coding: utf-8 -*-
 """Tools to handle logfiles from the V25 microcontroller's memory card."""
 
+import fnmatch
 import os
 import pathlib
 import platform
+import re
 from datetime import datetime, timezone
 from itertools import chain
-from typing import Iterator, Optional, Union
+from typing import Optional, Union
 
 import tomli as toml_r
 
-from pyfuppes.misc import insensitive_pattern, to_list_of_Path
+from pyfuppes.misc import to_list_of_Path
 from pyfuppes.txt2dict import txt_2_dict
 
 try:
@@ -33,23 +35,30 @@ V25_DATA_MIN_NLINES = 2
 
 def _get_sel_files(
     folders: list[pathlib.Path], file_extensions: list[str], insensitive: bool = True
-) -> Iterator[pathlib.Path]:
+) -> list[pathlib.Path]:
     """
-    Make an iterator that yields all files in "folders" having one of the extensions listed in "file_extensions".
+    Make a list of all files in "folders" having one of the extensions listed in "file_extensions".
 
-    Keyword "insensitive" only has an effect on Unix platforms - on Windows, glob is always case-insensitive.
+    Extensions are glob patterns, as in folder.glob(f"*{ext}"). Keyword "insensitive" only has
+    an effect on Unix platforms - on Windows, file names are always matched case-insensitive.
+    Each folder is listed only once; its matches are grouped per extension, in the order given.
     """
     assert all(
         (isinstance(i, list) for i in (folders, file_extensions))
     ), "all inputs must be of type list."
 
-    if insensitive and platform.system().lower() != "windows":
-        file_extensions = [insensitive_pattern(e) for e in file_extensions]
+    flags = re.IGNORECASE if insensitive or platform.system().lower() == "windows" else 0
+    patterns = [re.compile(fnmatch.translate(f"*{e}"), flags) for e in file_extensions]
 
-    sel_files = chain()
+    sel_files = []
     for f in folders:
-        for e in file_extensions:
-            sel_files = chain(sel_files, f.glob(f"*{e}"))
+        try:
+            with os.scandir(f) as entries:
+                names = [entry.name for entry in entries]
+        except OSError:  # not a directory or not accessible; nothing to select
+            continue
+        for p in patterns:
+            sel_files += [pathlib.Path(f, n) for n in names if p.match(n)]
 
     return sel_files
 
@@ -133,7 +142,7 @@ def logs_cleanup(
 
         while len([elem for elem in data[-1].strip(" \n").split(V25_DATA_SEP) if elem]) < n_cols:
             write = True
-            data = data[:-1]
+            data.pop()
             verboseprint(
                 f"*v25_logcleaner* deleted last line in {file.name} which has insufficient elements"
             )
@@ -146,12 +155,12 @@ def logs_cleanup(
             file.unlink()
             continue
 
-        # check for ragged lines
-        for idx, line in enumerate(data):
-            if idx < cfg[t]["min_n_lines"] - 1:  # skip header
-                continue
-            parts = line.strip(V25_DATA_SEP).split(V25_DATA_SEP)
-            if len(parts) != n_cols:
+        # check for ragged lines; skip header. counting separators does not
+        # create a list of fields for each line, only split if it is ragged.
+        for idx in range(max(cfg[t]["min_n_lines"] - 1, 0), len(data)):
+            line = data[idx]
+            if line.strip(V25_DATA_SEP).count(V25_DATA_SEP) + 1 != n_cols:
+                parts = line.strip(V25_DATA_SEP).split(V25_DATA_SEP)
                 verboseprint(
                     f"*v25_logcleaner* detected invalid number of fields in {file.name}, line {idx+1}"
                     f" - want {n_cols}, have {len(parts)} (truncated)"
@@ -267,7 +276,6 @@ def collect_V25Logs(
             del tmp
 
     if write_mergefile:  # optionally write merged data to file
-        n_el = len(data[keys[0]])  # type: ignore
         outfile = pathlib.Path(
             os.path.dirname(folder[0])
             + "/"
@@ -284,10 +292,10 @@ def collect_V25Logs(
             os.mkdir(os.path.dirname(outfile))
 
         if not outfile.exists():
+            # join rows and lines in one go; strict: all columns must have the same length
+            lines = map(delimiter.join, zip(*(data[k] for k in keys), strict=True))  # type: ignore
             with open(outfile, "w", encoding="UTF-8") as fobj:
-                fobj.write(delimiter.join(keys) + "\n")
-                for i in range(n_el):
-                    fobj.write(delimiter.join([data[k][i] for k in keys]) + "\n")  # type: ignore
+                fobj.write("\n".join(chain([delimiter.join(keys)], lines)) + "\n")
 
     verboseprint("V25 logfiles import done.")
 
@@ -441,10 +449,11 @@ def collect_OSC_Logs(
             os.mkdir(os.path.dirname(outfile))
 
         if not outfile.exists():
+            # convert column-wise to str, then join rows and lines in one go
+            cols = [list(map(str, osc_dat[k])) for k in keys_data]  # type: ignore
+            lines = map(delimiter.join, zip(*cols, strict=True))
             with open(outfile, "w", encoding="UTF-8") as fobj:  # write the merge file
-                fobj.write(delimiter.join(keys_data) + "\n")
-                for i, _ in enumerate(osc_dat["POSIX"]):  # type: ignore
-                    fobj.write(delimiter.join(map(str, [osc_dat[k][i] for k in keys_data])) + "\n")  # type: ignore
+                fobj.write("\n".join(chain([delimiter.join(keys_data)], lines)) + "\n")
 
     verboseprint("OSC logfiles import done.")
 
@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
 
+import os
+import tempfile
 import unittest
 from io import BytesIO, StringIO
 from pathlib import Path
 
+import numpy as np
 import polars as pl
 
 from pyfuppes.na1001 import FFI1001 as na1001
@@ -53,6 +56,17 @@ class TestNa1001(unittest.TestCase):
         na = na1001(file, sep_data="\t")
         self.assertEqual(len(na._HEADER), na.NLHEAD)
 
+    def test_nlhead(self):
+        na = na1001()
+        self.assertEqual(na.NLHEAD, 15)
+        na.SCOM = ["a", "b"]
+        na.NCOM = ["c"]
+        na.VNAME = ["v0", "v1", "v2"]
+        self.assertEqual(na.NLHEAD, 14 + 2 + 1 + 3)
+        na.NLHEAD = 20  # consistent value is accepted
+        with self.assertRaises(ValueError):
+            na.NLHEAD = 21
+
     def test_invalid_read_config(self):
         file = src / "validate_na/valid_1001a.na"
         with self.assertRaises(Exception):
@@ -118,6 +132,47 @@ TimeCRef	Ozone"""
         na = na1001(BytesIO(bytes(s, "utf-8")), allow_emtpy_data=True)
         self.assertEqual(len(na._HEADER), na.NLHEAD)
 
+    def test_write(self):
+        na = na1001(src / "validate_na/OM_20200304_591_CPT_MUC_V01_valid0.txt", sep_data="\t")
+        with tempfile.TemporaryDirectory() as tmp:
+            file = Path(tmp) / "out.na"
+            self.assertEqual(na.to_file(file), 1)
+            self.assertEqual(na.to_file(file), 0)  # exists, no overwrite
+            self.assertEqual(na.to_file(file, overwrite=1), 2)
+            na_read = na1001(file, sep_data="\t")
+            self.assertEqual(na_read._X, na._X)
+            self.assertEqual(na_read._V, na._V)
+            # the writer's header corrections are applied to the instance
+            na._SCOM = na._SCOM + ["one more special comment"]
+            self.assertEqual(na.to_file(file, overwrite=1), 2)
+            self.assertEqual(na.NSCOML, len(na.SCOM))
+            self.assertEqual(na1001(file, sep_data="\t").NLHEAD, na.NLHEAD)
+            # float dates are written like integers
+            na.DATE, na.RDATE = [2020.0, 3.0, 4.0], (2021.0, 12.0, 31.0)
+            self.assertEqual(na.to_file(file, overwrite=1), 2)
+            na_read = na1001(file, sep_data="\t")
+            self.assertEqual(list(na_read.DATE), [2020, 3, 4])
+            self.assertEqual(list(na_read.RDATE), [2021, 12, 31])
+            # file name only: write to current working directory
+            cwd = os.getcwd()
+            try:
+                os.chdir(tmp)
+                self.assertEqual(na.to_file("out_cwd.na"), 1)
+            finally:
+                os.chdir(cwd)
+
+    def test_vmiss(self):
+        na = na1001(src / "validate_na/OM_20200304_591_CPT_MUC_V01_valid0.txt", sep_data="\t")
+        na.VMISS[0] = "99999.9"  # in-place edits must be respected
+        na._V[0][:3] = ["99999.9", "99999.5", "42"]  # 99999.5 is valid data, not VMISS
+        d = na.to_dict_nparray()
+        self.assertTrue(np.isnan(d["Ozone"][0]))
+        self.assertEqual(d["Ozone"][1:3].tolist(), [99999.5, 42.0])
+        for dtype in (np.float64, np.float32):
+            v = na.to_pddf(dtype=dtype)["Ozone"].to_numpy()
+            self.assertTrue(np.isnan(v[0]))
+            self.assertFalse(np.isnan(v[1:3]).any())
+
     def test_poldf(self):
         file = src / "validate_na/OM_20200304_591_CPT_MUC_V01_valid0.txt"
         na = na1001(file, sep_data="\t")
@@ -2,6 +2,8 @@
 
 import unittest
 
+import numpy as np
+
 from pyfuppes import numberstring
 
 
@@ -87,6 +89,13 @@ class TestNumberstring(unittest.TestCase):
             numberstring.dec2str_stripped(numbers, dec_places=3, strip="both")[0],
         )
 
+        self.assertEqual(["3.445"], numberstring.dec2str_stripped(3.44532, dec_places=3))
+        self.assertEqual([".12"], numberstring.dec2str_stripped(np.float64(0.12011), strip="both"))
+        self.assertEqual([".5"], numberstring.dec2str_stripped({0.5}, strip="both"))
+        self.assertEqual(
+            ["0.", "1.5"], numberstring.dec2str_stripped(n / 2 for n in range(0, 4, 3))
+        )
+
         numbers = [1.0, 3.44532, 0.12011]
         self.assertEqual(
             ["1.", "3.445", "0.12"],
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import numpy as np
+
+from pyfuppes.signalsteps import SteppedData
+
+
+class TestSignalsteps(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # to run before all tests
+        pass
+
+    @classmethod
+    def tearDownClass(cls):
+        # to run after all tests
+        pass
+
+    def setUp(self):
+        # to run before each test
+        pass
+
+    def tearDown(self):
+        # to run after each test
+        pass
+
+    def test_detect_steps(self):
+        v = np.repeat([0.0, 100.0, 50.0], 10)
+        result = SteppedData(v.copy()).detect_steps([2, 2], thresh=20, plot=False)
+        self.assertEqual(result.n_steps, 2)
+        self.assertEqual(result.n_plats, 3)
+        self.assertEqual(len(result.log), v.size)
+        self.assertListEqual(list(np.flatnonzero(result.log == 1)), [8, 9, 10, 11])
+        self.assertListEqual(list(np.flatnonzero(result.log == -1)), [18, 19, 20, 21])
+        self.assertListEqual(result.len_plats, [8, 6, 8])
+        self.assertListEqual(result.len_steps, [4, 4])
+        self.assertTrue((result.values_plat == v[result.log == 0]).all())
+
+        # an empty window has no mean, so no steps are detected
+        for look_around in ([0, 2], [2, 0]):
+            result = SteppedData(v.copy()).detect_steps(look_around, thresh=20, plot=False)
+            self.assertEqual(result.n_steps, 0)
+            self.assertFalse(result.log.any())
+
+    def test_plat_stat(self):
+        v = np.repeat([0.0, 100.0, 50.0], 10)
+        v[1:5] += [1.0, -1.0, 2.0, -2.0]
+        result = SteppedData(v.copy()).detect_steps([2, 2], thresh=20, plot=False)
+        result.plat_stat([1, 1], use_last_n=0)
+        self.assertListEqual(result.plat_nv, [6, 4, 6])
+        self.assertTrue(np.allclose(result.plat_mean, [0.0, 100.0, 50.0]))
+        self.assertTrue(np.allclose(result.plat_median, [0.0, 100.0, 50.0]))
+        self.assertAlmostEqual(result.plat_stddev[0], np.std(v[1:7]))
+        self.assertAlmostEqual(result.plat_eom[0], np.std(v[1:7]) / np.sqrt(6))
+        self.assertEqual(len(result.plat_rsd), result.n_plats)
+
+        with self.assertRaises(ValueError):
+            SteppedData(np.zeros(0)).plat_stat([1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -61,6 +61,26 @@ class TestTimeconv(unittest.TestCase):
         t = "2012-01-01T00:00:00+02:00"
         result = timeconversion.dtstr_2_mdns(t, f)
         self.assertEqual(int(result), 0)
+        # fractional seconds, next day, unpadded fields
+        t = ["01.01.2012 00:00:00.5", "2.1.2012 0:00:01.25"]
+        f = "%d.%m.%Y %H:%M:%S.%f"
+        result = timeconversion.dtstr_2_mdns(t, f)
+        self.assertEqual(result, [0.5, 86401.25])
+        with self.assertRaises(ValueError):
+            _ = timeconversion.dtstr_2_mdns(["01.13.2012 00:00:00.5"], f)
+        # iso: same results as datetime.fromisoformat, also for old dates
+        result = timeconversion.dtstr_2_mdns(["1500-01-01T01:00:00", "1500-01-02"], "iso")
+        self.assertEqual(result, [3600.0, 86400.0])
+        for t in ("", "NaT", "2012", "2012-01", "today"):  # numpy parses these
+            with self.assertRaises(ValueError):
+                _ = timeconversion.dtstr_2_mdns(t, "iso")
+        # UTC offsets: parsed by datetime.fromisoformat, not numpy
+        for t, want in (
+            ("2012-01-01T01:00:00+02:00", 3600.0),
+            ("2012-01-01T02:00:00-05:00", 7200.0),
+        ):
+            self.assertEqual(timeconversion.dtstr_2_mdns([t], "iso"), [want])
+            self.assertIsNone(timeconversion._isostr_2_mdns([t]))
 
     def test_dtobj_2_mdns(self):
         t = [datetime(2000, 1, 1, 1), datetime(2000, 1, 1, 2)]
@@ -72,6 +92,13 @@ class TestTimeconv(unittest.TestCase):
         ]
         result = list(map(int, timeconversion.dtobj_2_mdns(t)))
         self.assertEqual(result, [3600, 7200])
+        # reference date, fractional seconds, array in -> array out
+        t = np.array([datetime(1999, 12, 31, 23, 59, 59, 500000), datetime(2000, 1, 1, 0, 0, 1)])
+        result = timeconversion.dtobj_2_mdns(t, ref_date=(2000, 1, 1))
+        self.assertTrue(isinstance(result, np.ndarray))
+        self.assertListEqual(list(result), [-0.5, 1.0])
+        result = timeconversion.dtobj_2_mdns(t)
+        self.assertListEqual(list(result), [86399.5, 1.0])
 
     def test_unixtime_2_mdns(self):
         t = [3600, 7200, 10800]
@@ -83,6 +110,9 @@ class TestTimeconv(unittest.TestCase):
         ref = datetime(2020, 5, 15, tzinfo=timezone.utc)
         result = list(map(int, timeconversion.mdns_2_dtobj(t, ref, posix=True)))
         self.assertEqual(result, [1589504400, 1589511600, 1590364800])
+        for t, ref in ((-1, (1, 1, 1)), (86400, (9999, 12, 31)), (1e15, (2020, 1, 1))):
+            with self.assertRaises(OverflowError):
+                timeconversion.mdns_2_dtobj([0, t], ref)
 
     def test_daysSince_2_dtobj(self):
         t0, off = datetime(2020, 5, 10), 10.5
@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 
+import functools
 import unittest
 
 import numpy as np
 import polars as pl
+import scipy as sc
 from polars.testing import assert_frame_not_equal
 
 from pyfuppes import timecorr
@@ -69,6 +71,17 @@ class TestTimecorr(unittest.TestCase):
         result = timecorr.correct_time(t, r, order)
         self.assertTrue(np.isclose(result.t_corr, r).all())
 
+    def test_apply_time_correction(self):
+        t = np.array([1, 2, 3, 4, 5, 6], dtype=float)
+        r = np.array([2.0, 3.5, 5.0, 6.5, 8.0, 9.5])
+        for order in (0, 1, 2):
+            result = timecorr.correct_time(t, r, order)
+            t_corr = timecorr.apply_time_correction(t, result.fitparms)
+            self.assertTrue(np.allclose(t_corr, result.t_corr))
+        # parameters apply to other time vectors as well
+        t_corr = timecorr.apply_time_correction(np.array([7.0, 8.0]), result.fitparms)
+        self.assertTrue(np.allclose(t_corr, [11.0, 12.5]))
+
     def test_pldt_filter(self):
         # edge case: first invalid
         have = ["2022-10-30", "2022-10-28", "2022-10-29"]
@@ -140,6 +153,21 @@ class TestTimecorr(unittest.TestCase):
         self.assertTrue((df_out["values"] == pl.Series([2, 3])).all())
         assert_frame_not_equal(df, df_out)
 
+    def test_xcorr_fft(self):
+        rng = np.random.default_rng(42)
+        for n1, n2 in ((5, 5), (7, 3), (300, 200), (1000, 1000)):
+            f, g = rng.normal(size=n1), rng.normal(size=n2)
+            self.assertTrue(np.allclose(timecorr.xcorr_fft(f, g), sc.signal.correlate(f, g)))
+        # single precision input stays single precision
+        f, g = f.astype(np.float32), g.astype(np.float32)
+        self.assertEqual(timecorr.xcorr_fft(f, g).dtype, np.float32)
+        # 2D input: row-wise correlation
+        fs, gs = rng.normal(size=(3, 50)), rng.normal(size=(3, 40))
+        result = timecorr.xcorr_fft(fs, gs)
+        self.assertEqual(result.shape, (3, 89))
+        for i in range(3):
+            self.assertTrue(np.allclose(result[i], sc.signal.correlate(fs[i], gs[i])))
+
     def test_xcorr_timelag(self):
         # signal with peak
         t = np.linspace(0, 250, 250)
@@ -148,6 +176,30 @@ class TestTimecorr(unittest.TestCase):
         lag = timecorr.xcorr_timelag(t, f, t, g, show_plots=False)
         # print(l, 90)
         self.assertTrue(abs(lag - 90) < (90 * 0.02))  # shift is 90... expect within 2%
+        lag = timecorr.xcorr_timelag(
+            t, f.astype(np.float32), t, g.astype(np.float32), show_plots=False
+        )
+        self.assertTrue(abs(lag - 90) < (90 * 0.02))
+        lag = timecorr.xcorr_timelag(t, f, t, g, show_plots=False, peak_stride=25)
+        self.assertTrue(abs(lag - 90) < (90 * 0.02))
+        for func in (sc.signal.correlate, functools.partial(sc.signal.correlate, method="auto")):
+            lag = timecorr.xcorr_timelag(t, f, t, g, show_plots=False, xcorr_func=func)
+            self.assertTrue(abs(lag - 90) < (90 * 0.02))
+        # np.correlate, and the modes of np.correlate / scipy.signal.correlate
+        for func in (
+            functools.partial(np.correlate, mode="full"),
+            functools.partial(np.correlate, mode="same"),
+            functools.partial(sc.signal.correlate, mode="same"),
+        ):
+            lag = timecorr.xcorr_timelag(
+                t, f, t, g, show_plots=False, xcorr_func=func, boundaries=(50, 150)
+            )
+            self.assertTrue(abs(lag - 90) < (90 * 0.02))
+        # mode "valid": lag 0 only
+        lag = timecorr.xcorr_timelag(t, f, t, g, show_plots=False, xcorr_func=np.correlate)
+        self.assertEqual(lag, 0)
+        with self.assertRaises(ValueError):
+            timecorr.xcorr_timelag(t, f, t, g, show_plots=False, xcorr_func=np.convolve)
 
         # Sawtooth wave
         # https://stackoverflow.com/questions/4688715/find-time-shift-between-two-similar-waveforms
@@ -185,6 +237,30 @@ class TestTimecorr(unittest.TestCase):
         # shift is 90... expect within 2%
         self.assertTrue(abs(lag - 3) < (3 * 0.02))
 
+    def test_xcorr_timelag_map(self):
+        t = np.linspace(0, 250, 250)
+        f = 10 * np.exp(-((t - 90) ** 2) / 8) + 99
+        pairs = [(t, f, t, 10 * np.exp(-((t - 90 - lag) ** 2) / 8) + 41) for lag in (10, 50)]
+        for max_workers in (1, 2):
+            lags = timecorr.xcorr_timelag_map(pairs, max_workers=max_workers, upscale=10)
+            self.assertTrue(np.allclose(lags, [10, 50], atol=0.5))
+        self.assertEqual(timecorr.xcorr_timelag_map([]).size, 0)
+
+    def test_xcorr_plan(self):
+        t1 = np.linspace(0, 250, 250)
+        t2 = np.linspace(0, 250, 200)
+        f = np.array([10 * np.exp(-((t1 - 90) ** 2) / 8) + 99 for _ in range(3)])
+        g = np.array([10 * np.exp(-((t2 - 90 - lag) ** 2) / 8) + 41 for lag in (10, 30, 50)])
+        plan = timecorr.xcorr_plan(t1, t2, upscale=10)
+        lags = timecorr.xcorr_timelag_apply(plan, f, g)
+        want = [
+            timecorr.xcorr_timelag(t1, a, t2, b, upscale=10, show_plots=False) for a, b in zip(f, g)
+        ]
+        self.assertTrue(np.allclose(lags, want))
+        # single pair and 1D reference vs. 2D data
+        self.assertEqual(timecorr.xcorr_timelag_apply(plan, f[0], g[0]), want[0])
+        self.assertTrue(np.allclose(timecorr.xcorr_timelag_apply(plan, f[0], g), want))
+
 
 if __name__ == "__main__":
     unittest.main()
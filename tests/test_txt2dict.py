@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 
+import tempfile
 import unittest
 from pathlib import Path
 
+import numpy as np
+
 from pyfuppes import txt2dict
 
 try:
@@ -57,6 +60,19 @@ class TestTimecorr(unittest.TestCase):
         self.assertListEqual(["TimeCRef", "Özone"], list(d.data.keys()))
         self.assertEqual(len(d.file_hdr), 36)
 
+    def test_txt2dict_strip_values(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            file = Path(tmp) / "padded.csv"
+            file.write_text("a;b\n 1;2 \n3 ; 4\n", encoding="utf-8")
+            d = txt2dict.txt_2_dict(file)
+            self.assertDictEqual(d.data, {"a": ["1", "3"], "b": ["2", "4"]})
+            d = txt2dict.txt_2_dict(file, strip_values=False)
+            self.assertDictEqual(d.data, {"a": [" 1", "3 "], "b": ["2 ", " 4"]})
+            d = txt2dict.txt_2_dict(file, to_float=True)
+            self.assertEqual(d.data["a"].dtype, np.float64)
+            self.assertListEqual(d.data["a"].tolist(), [1.0, 3.0])
+            self.assertListEqual(d.data["b"].tolist(), [2.0, 4.0])
+
 
 if __name__ == "__main__":
     unittest.main()